@@ -0,0 +1,349 @@
+import argparse
+import contextlib
+import cProfile
+import io
+import json
+import multiprocessing as mp
+import os
+import platform
+import pstats
+import random
+import resource
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+from keyword_matcher import KeywordMatcher
+from log_analytics import LogAnalytics
+from log_store import format_timestamp
+from log_writer import LogJsonWriter
+from main import (DANGER_KEYWORDS, DANGER_MATCHER, build_log_store,
+                  convert_to_dict_by_time, filter_danger_logs, iter_log_file,
+                  iter_parse_log_lines, parse_log_lines, read_log_file,
+                  save_to_json, sort_logs_by_time)
+
+SUITES = ('pipeline', 'keywords', 'store', 'writer', 'analytics')
+
+MESSAGES = (
+    'Rocket initialization process started.',
+    'Power systems online. Batteries at optimal charge.',
+    'Communication established with mission control.',
+    'Navigation systems show nominal performance.',
+    'Oxygen tank unstable.',
+    'Oxygen tank explosion.',
+    '연료 라인 압력 정상.',
+    '냉각수 누출 감지, 점검 필요.',
+    '엔진 고온 경고.',
+)
+
+
+def synthetic_messages(n, seed=0):
+    rng = random.Random(seed)
+    return [f'{rng.choice(MESSAGES)} seq={i}' for i in range(n)]
+
+
+def synthetic_keywords(n, seed=0):
+    rng = random.Random(seed)
+    syllables = '가나다라마바사아자차카타파하'
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    keywords = list(DANGER_KEYWORDS)
+    while len(keywords) < n:
+        if rng.random() < 0.5:
+            word = ''.join(rng.choice(syllables) for _ in range(3))
+        else:
+            word = ''.join(rng.choice(letters) for _ in range(7))
+        keywords.append(word)
+    return keywords
+
+
+LEVELS = ('INFO', 'INFO', 'INFO', 'WARNING', 'ERROR')
+BASE_SECONDS = 1693130400  # 2023-08-27 10:00:00
+
+
+def synthetic_log_lines(n, seed=0):
+    rng = random.Random(seed)
+    messages = synthetic_messages(n, seed)
+    lines = ['timestamp,event,message\n']
+    for i, message in enumerate(messages):
+        timestamp = format_timestamp(BASE_SECONDS + i)
+        lines.append(f'{timestamp},{rng.choice(LEVELS)},{message}\n')
+    return lines
+
+
+def write_synthetic_log(path, n, seed=0):
+    # 큰 로그도 메모리에 올리지 않고 한 줄씩 만들어 쓴다.
+    rng = random.Random(seed)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('timestamp,event,message\n')
+        for i in range(n):
+            timestamp = format_timestamp(BASE_SECONDS + i // 10)
+            f.write(f'{timestamp},{rng.choice(LEVELS)},'
+                    f'{rng.choice(MESSAGES)} seq={i}\n')
+
+
+def measure_memory(func, *args):
+    tracemalloc.start()
+    result = func(*args)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, result
+
+
+def time_call(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def loop_filter(messages, keywords):
+    return [m for m in messages
+            if any(k.lower() in m.lower() for k in keywords)]
+
+
+def matcher_filter(messages, matcher):
+    return [m for m in messages if matcher.search(m)]
+
+
+def bench_keyword_matcher(n_lines, keyword_counts):
+    messages = synthetic_messages(n_lines)
+    print(f'[위험 키워드 매칭] {n_lines:,}줄')
+    for n_keywords in keyword_counts:
+        keywords = synthetic_keywords(n_keywords)
+        build_time, matcher = time_call(KeywordMatcher, keywords)
+        loop_time, expected = time_call(loop_filter, messages, keywords)
+        match_time, found = time_call(matcher_filter, messages, matcher)
+        if found != expected:
+            raise AssertionError('매칭 결과가 기존 루프와 다릅니다.')
+        print(f'  키워드 {n_keywords:>4}개: 기존 루프 {loop_time:.3f}s, '
+              f'KeywordMatcher {match_time:.3f}s (빌드 {build_time:.4f}s), '
+              f'{loop_time / match_time:.1f}배')
+
+
+def bench_log_store(n_lines):
+    lines = synthetic_log_lines(n_lines)
+    list_bytes, logs = measure_memory(parse_log_lines, lines)
+    store_bytes, store = measure_memory(
+        lambda: build_log_store(iter_parse_log_lines(lines)))
+    if store.to_list() != logs:
+        raise AssertionError('LogStore 내용이 리스트와 다릅니다.')
+
+    scale = 1_000_000 / n_lines
+    print(f'[파싱 결과 메모리] {n_lines:,}줄 기준, 100만 줄 환산')
+    print(f'  리스트 레코드: {list_bytes * scale / 2**20:,.1f} MiB '
+          f'({list_bytes / n_lines:.0f} B/줄)')
+    print(f'  LogStore    : {store_bytes * scale / 2**20:,.1f} MiB '
+          f'({store_bytes / n_lines:.0f} B/줄)')
+
+
+def write_with_json_dump(lines, path):
+    log_dict = convert_to_dict_by_time(parse_log_lines(lines))
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(log_dict, f, indent=4, ensure_ascii=False)
+
+
+def write_with_writer(lines, path, fmt, compress):
+    with LogJsonWriter(path, fmt, compress) as writer:
+        for log in iter_parse_log_lines(lines):
+            writer.write(*log)
+
+
+def measure_peak(func, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def bench_json_writer(n_lines):
+    lines = synthetic_log_lines(n_lines)
+    cases = [
+        ('json.dump(indent=4)', write_with_json_dump, ()),
+        ('writer pretty', write_with_writer, ('pretty', None)),
+        ('writer json', write_with_writer, ('json', None)),
+        ('writer ndjson', write_with_writer, ('ndjson', None)),
+        ('writer ndjson+gzip', write_with_writer, ('ndjson', 'gzip')),
+    ]
+    print(f'[JSON 저장] {n_lines:,}줄')
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'out')
+        for name, func, extra in cases:
+            elapsed, peak = measure_peak(func, lines, path, *extra)
+            size = os.path.getsize(path)
+            print(f'  {name:<20} {elapsed:.3f}s, '
+                  f'{n_lines / elapsed:,.0f}줄/s, '
+                  f'{size / elapsed / 2**20:.1f} MiB/s, '
+                  f'최대 메모리 {peak / 2**20:.1f} MiB')
+
+
+def bench_analytics(n_lines):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'synthetic.log')
+        write_synthetic_log(path, n_lines)
+
+        analytics = LogAnalytics(DANGER_MATCHER)
+        start = time.perf_counter()
+        analytics.add_logs(iter_parse_log_lines(iter_log_file(path)))
+        scan_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        report = analytics.report()
+        report_time = time.perf_counter() - start
+
+    print(f'[로그 통계] {n_lines:,}줄')
+    print(f'  한 번 읽기+누적 {scan_time:.2f}s '
+          f'({n_lines / scan_time:,.0f}줄/s), 집계 {report_time:.3f}s')
+    print(f'  구간 {len(report["histogram"]):,}개, '
+          f'위험 이벤트 {report["danger_events"]:,}건')
+
+
+def peak_rss_mb():
+    # 리눅스의 ru_maxrss 단위는 KiB다.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_pipeline(log_path, tmp_dir, trace=False, profiler=None):
+    # main()과 같은 순서로 단계를 돌리며 단계별 시간/메모리를 잰다.
+    danger_path = os.path.join(tmp_dir, 'danger.log')
+    json_path = os.path.join(tmp_dir, 'out.json')
+    stages = [
+        ('read_log_file', lambda _: read_log_file(log_path)),
+        ('parse_log_lines', parse_log_lines),
+        ('filter_danger_logs',
+         lambda logs: (filter_danger_logs(logs, danger_path), logs)[1]),
+        ('sort_logs_by_time', sort_logs_by_time),
+        ('convert_to_dict_by_time', convert_to_dict_by_time),
+        ('save_to_json', lambda data: save_to_json(data, json_path, [])),
+    ]
+
+    results = []
+    value = None
+    for name, stage in stages:
+        if trace:
+            tracemalloc.start()
+        if profiler is not None:
+            profiler.enable()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            value = stage(value)
+        elapsed = time.perf_counter() - start
+        if profiler is not None:
+            profiler.disable()
+
+        result = {'stage': name, 'seconds': round(elapsed, 4),
+                  'peak_rss_mb': round(peak_rss_mb(), 1)}
+        if trace:
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            result['alloc_net_mb'] = round(current / 2**20, 2)
+            result['alloc_peak_mb'] = round(peak / 2**20, 2)
+        results.append(result)
+    return results
+
+
+def bench_pipeline_size(n_lines, trace=False, profile_path=None):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        log_path = os.path.join(tmp_dir, 'synthetic.log')
+        write_synthetic_log(log_path, n_lines)
+
+        profiler = cProfile.Profile() if profile_path else None
+        stages = run_pipeline(log_path, tmp_dir, trace, profiler)
+
+    if profiler is not None:
+        profiler.dump_stats(profile_path)
+    return stages
+
+
+def bench_pipeline(sizes, trace=False, profile_dir=None):
+    # 크기마다 새 프로세스에서 돌려야 최대 RSS가 이전 실행과 섞이지 않는다.
+    context = mp.get_context('spawn')
+    runs = []
+    for n_lines in sizes:
+        profile_path = None
+        if profile_dir is not None:
+            profile_path = os.path.join(profile_dir,
+                                        f'pipeline_{n_lines}.prof')
+
+        with context.Pool(1) as pool:
+            stages = pool.apply(bench_pipeline_size,
+                                (n_lines, trace, profile_path))
+
+        print(f'[파이프라인] {n_lines:,}줄')
+        for stage in stages:
+            line = (f'  {stage["stage"]:<24} {stage["seconds"]:>9.3f}s  '
+                    f'최대 RSS {stage["peak_rss_mb"]:>9,.1f} MiB')
+            if trace:
+                line += (f'  할당 순증 {stage["alloc_net_mb"]:>9,.1f} MiB, '
+                         f'최대 {stage["alloc_peak_mb"]:>9,.1f} MiB')
+            print(line)
+
+        if profile_path is not None:
+            print(f'  cProfile 저장: {profile_path}')
+            stats = pstats.Stats(profile_path)
+            stats.sort_stats('cumulative').print_stats(10)
+
+        runs.append({'lines': n_lines, 'stages': stages})
+    return runs
+
+
+def save_results(path, args, runs):
+    data = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'tracemalloc': args.tracemalloc,
+        'runs': runs,
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=4, ensure_ascii=False)
+    print(f'벤치마크 결과 저장 완료: {path}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ch1 로그 파이프라인 벤치마크')
+    parser.add_argument('suites', nargs='*', metavar='SUITE',
+                        help='실행할 벤치마크: ' + ', '.join(SUITES)
+                             + ', all (기본: pipeline)')
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[10_000, 1_000_000, 10_000_000],
+                        help='pipeline 합성 로그 줄 수')
+    parser.add_argument('--tracemalloc', action='store_true',
+                        help='단계별 할당량 측정 (느려짐)')
+    parser.add_argument('--profile', metavar='DIR',
+                        help='크기별 cProfile 결과를 DIR에 저장')
+    parser.add_argument('--output', metavar='FILE',
+                        help='pipeline 결과를 JSON으로 저장')
+    parser.add_argument('--lines', type=int, default=100_000)
+    parser.add_argument('--keywords', type=int, nargs='+',
+                        default=[6, 50, 200, 500])
+    parser.add_argument('--analytics-lines', type=int, default=10_000_000)
+    args = parser.parse_args()
+
+    suites = args.suites or ['pipeline']
+    unknown = set(suites) - set(SUITES) - {'all'}
+    if unknown:
+        parser.error(f'알 수 없는 벤치마크: {", ".join(sorted(unknown))}')
+    if 'all' in suites:
+        suites = SUITES
+
+    if 'pipeline' in suites:
+        if args.profile:
+            os.makedirs(args.profile, exist_ok=True)
+        runs = bench_pipeline(args.sizes, args.tracemalloc, args.profile)
+        if args.output:
+            save_results(args.output, args, runs)
+    if 'keywords' in suites:
+        bench_keyword_matcher(args.lines, args.keywords)
+    if 'store' in suites:
+        bench_log_store(args.lines)
+    if 'writer' in suites:
+        bench_json_writer(args.lines)
+    if 'analytics' in suites:
+        bench_analytics(args.analytics_lines)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+from collections import deque
+
+# 키워드가 이보다 적으면 메시지를 한 번 소문자로 바꾼 뒤 C로 구현된
+# 부분 문자열 검색을 돌리는 편이 파이썬 오토마타 순회보다 빠르다.
+SMALL_KEYWORD_SET = 40
+
+
+class KeywordMatcher:
+    # Aho-Corasick 오토마타: 키워드 수와 무관하게 메시지를 한 번만 훑는다.
+
+    def __init__(self, keywords):
+        self.keywords = []
+        self.patterns = []
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [()]
+
+        seen = set()
+        for keyword in keywords:
+            pattern = keyword.strip().lower()
+            if not pattern or pattern in seen:
+                continue
+            seen.add(pattern)
+            self.keywords.append(keyword.strip())
+            self.patterns.append(pattern)
+            self._add(pattern, len(self.keywords) - 1)
+
+        self.small = len(self.patterns) < SMALL_KEYWORD_SET
+        self._build()
+
+    def _add(self, pattern, keyword_id):
+        state = 0
+        for char in pattern:
+            next_state = self.goto[state].get(char)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][char] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append(())
+            state = next_state
+        self.output[state] = self.output[state] + (keyword_id,)
+
+    def _build(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[next_state] = target if target != next_state else 0
+                fail_output = self.output[self.fail[next_state]]
+                self.output[next_state] = self.output[next_state] + fail_output
+
+    def _scan(self, text):
+        goto = self.goto
+        fail = self.fail
+        output = self.output
+        state = 0
+        for char in text.lower():
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                yield output[state]
+
+    def search(self, text):
+        if self.small:
+            lowered = text.lower()
+            return any(pattern in lowered for pattern in self.patterns)
+        return any(True for _ in self._scan(text))
+
+    def find(self, text):
+        if self.small:
+            lowered = text.lower()
+            return [keyword for keyword, pattern
+                    in zip(self.keywords, self.patterns) if pattern in lowered]
+
+        hits = set()
+        for keyword_ids in self._scan(text):
+            hits.update(keyword_ids)
+        return [self.keywords[i] for i in sorted(hits)]
+
+
+def load_keywords(path):
+    keywords = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                keywords.append(line)
+    return keywords
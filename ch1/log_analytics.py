@@ -0,0 +1,181 @@
+import re
+from array import array
+from collections import Counter
+
+from log_store import LogStore, format_timestamp, parse_timestamp
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+NUMBER_PATTERN = re.compile(r'\d+(?:\.\d+)?')
+
+
+def message_template(message):
+    return NUMBER_PATTERN.sub('<num>', message)
+
+
+class LogAnalytics:
+    # 로그를 한 번만 훑으면서 시각/레벨 배열과 템플릿 빈도를 모으고,
+    # 집계는 report()에서 NumPy로 한꺼번에 계산한다.
+
+    def __init__(self, matcher=None, bucket_seconds=60, top_n=10):
+        self.matcher = matcher
+        self.bucket_seconds = bucket_seconds
+        self.top_n = top_n
+        self.timestamps = array('q')
+        self.levels = array('H')
+        self.level_names = []
+        self.level_codes = {}
+        self.danger_times = array('q')
+        self.templates = Counter()
+        self.skipped = 0
+        self.last_timestamp = None
+        self.last_seconds = None
+
+    def level_code(self, events):
+        code = self.level_codes.get(events)
+        if code is None:
+            code = len(self.level_names)
+            self.level_names.append(events)
+            self.level_codes[events] = code
+        return code
+
+    def add(self, timestamp, events, message):
+        if timestamp != self.last_timestamp:
+            try:
+                self.last_seconds = parse_timestamp(timestamp)
+
+            except ValueError:
+                self.skipped += 1
+                return
+            self.last_timestamp = timestamp
+
+        seconds = self.last_seconds
+        self.timestamps.append(seconds)
+        self.levels.append(self.level_code(events))
+        self.templates[message_template(message)] += 1
+        if self.matcher is not None and self.matcher.search(message):
+            self.danger_times.append(seconds)
+
+    def add_logs(self, logs):
+        if isinstance(logs, LogStore):
+            self.add_store(logs)
+            return self
+        for timestamp, events, message in logs:
+            self.add(timestamp, events, message)
+        return self
+
+    def add_store(self, store):
+        # 표준 형식이 아닌 시각이 섞여 있으면 리스트와 똑같이 행마다 처리한다.
+        if store.raw_timestamps:
+            for timestamp, events, message in store:
+                self.add(timestamp, events, message)
+            return
+
+        # LogStore는 이미 정수 시각과 레벨 코드를 갖고 있으므로 그대로 붙인다.
+        codes = [self.level_code(name) for name in store.level_names]
+        self.timestamps.extend(store.timestamps)
+        self.levels.extend(codes[code] for code in store.levels)
+        for seconds, message in zip(store.timestamps, store.messages):
+            self.templates[message_template(message)] += 1
+            if self.matcher is not None and self.matcher.search(message):
+                self.danger_times.append(seconds)
+
+    def histogram(self):
+        if not self.timestamps:
+            return []
+
+        n_levels = len(self.level_names)
+        if np is not None:
+            timestamps = np.frombuffer(self.timestamps, dtype=np.int64)
+            levels = np.frombuffer(self.levels, dtype=np.uint16)
+            buckets = timestamps // self.bucket_seconds
+            first = int(buckets.min())
+            keys = (buckets - first) * n_levels + levels
+            unique_keys, counts = np.unique(keys, return_counts=True)
+            pairs = zip(unique_keys.tolist(), counts.tolist())
+        else:
+            first = min(self.timestamps) // self.bucket_seconds
+            keys = Counter((seconds // self.bucket_seconds - first) * n_levels
+                           + level for seconds, level
+                           in zip(self.timestamps, self.levels))
+            pairs = sorted(keys.items())
+
+        rows = []
+        for key, count in pairs:
+            bucket, level = divmod(key, n_levels)
+            start = (first + bucket) * self.bucket_seconds
+            if not rows or rows[-1][0] != start:
+                rows.append((start, {}))
+            rows[-1][1][self.level_names[level]] = count
+        return [(format_timestamp(start), counts) for start, counts in rows]
+
+    def danger_intervals(self):
+        if len(self.danger_times) < 2:
+            return None
+
+        if np is not None:
+            times = np.sort(np.frombuffer(self.danger_times, dtype=np.int64))
+            gaps = np.diff(times)
+            return {
+                'count': int(gaps.size),
+                'min': int(gaps.min()),
+                'max': int(gaps.max()),
+                'mean': float(gaps.mean()),
+                'median': float(np.median(gaps)),
+            }
+
+        times = sorted(self.danger_times)
+        gaps = sorted(b - a for a, b in zip(times, times[1:]))
+        middle = len(gaps) // 2
+        median = (gaps[middle] if len(gaps) % 2
+                  else (gaps[middle - 1] + gaps[middle]) / 2)
+        return {
+            'count': len(gaps),
+            'min': gaps[0],
+            'max': gaps[-1],
+            'mean': sum(gaps) / len(gaps),
+            'median': float(median),
+        }
+
+    def report(self):
+        return {
+            'bucket_seconds': self.bucket_seconds,
+            'total': len(self.timestamps),
+            'skipped': self.skipped,
+            'histogram': self.histogram(),
+            'danger_events': len(self.danger_times),
+            'danger_intervals': self.danger_intervals(),
+            'top_templates': self.templates.most_common(self.top_n),
+        }
+
+
+def analyze_logs(logs, matcher=None, bucket_seconds=60, top_n=10):
+    analytics = LogAnalytics(matcher, bucket_seconds, top_n)
+    analytics.add_logs(logs)
+    return analytics.report()
+
+
+def print_report(report):
+    print(f'\n[로그 통계] 전체 {report["total"]}줄, '
+          f'{report["bucket_seconds"]}초 단위')
+    if report['skipped']:
+        print(f'타임스탬프 형식 오류로 제외: {report["skipped"]}줄')
+
+    for start, counts in report['histogram']:
+        summary = ', '.join(f'{level} {count}'
+                            for level, count in counts.items())
+        print(f'  {start}  {summary}')
+
+    intervals = report['danger_intervals']
+    print(f'위험 이벤트: {report["danger_events"]}건')
+    if intervals:
+        print(f'  위험 이벤트 간격(초): 최소 {intervals["min"]}, '
+              f'최대 {intervals["max"]}, 평균 {intervals["mean"]:.1f}, '
+              f'중앙값 {intervals["median"]:.1f}')
+
+    print('자주 나온 메시지 템플릿:')
+    for template, count in report['top_templates']:
+        print(f'  {count:>8}  {template}')
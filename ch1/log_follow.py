@@ -0,0 +1,80 @@
+import os
+import time
+
+
+class LogFollower:
+    # tail -F처럼 파일 오프셋을 기억해 두고 새로 붙은 바이트만 읽는다.
+    # inode가 바뀌면 회전, 크기가 줄면 절단으로 보고 새 파일 처음부터 읽는다.
+
+    def __init__(self, filename, from_start=False, poll_interval=0.05):
+        self.filename = filename
+        self.poll_interval = poll_interval
+        self.f = None
+        self.file_id = None
+        self.buffer = b''
+        self.open(from_start)
+
+    def open(self, from_start=True):
+        try:
+            self.f = open(self.filename, 'rb')
+
+        except FileNotFoundError:
+            self.f = None
+            self.file_id = None
+            return
+
+        stat = os.fstat(self.f.fileno())
+        self.file_id = (stat.st_dev, stat.st_ino)
+        self.buffer = b''
+        if not from_start:
+            self.f.seek(0, os.SEEK_END)
+
+    def close(self):
+        if self.f is not None:
+            self.f.close()
+            self.f = None
+
+    def split_lines(self, data):
+        self.buffer += data
+        end = self.buffer.rfind(b'\n') + 1
+        if not end:
+            return []
+        complete = self.buffer[:end]
+        self.buffer = self.buffer[end:]
+        return complete.decode('utf-8', errors='replace').split('\n')[:-1]
+
+    def read_new_lines(self):
+        if self.f is None:
+            self.open()
+            if self.f is None:
+                return []
+
+        try:
+            stat = os.stat(self.filename)
+
+        except FileNotFoundError:
+            # 회전 직후 새 파일이 아직 없으면 기존 파일의 남은 내용만 읽는다.
+            return self.split_lines(self.f.read())
+
+        lines = []
+        if (stat.st_dev, stat.st_ino) != self.file_id:
+            lines = self.split_lines(self.f.read())
+            if self.buffer:
+                lines.append(self.buffer.decode('utf-8', errors='replace'))
+            self.close()
+            self.open()
+        elif stat.st_size < self.f.tell():
+            self.f.seek(0)
+            self.buffer = b''
+
+        if self.f is not None:
+            lines.extend(self.split_lines(self.f.read()))
+        return lines
+
+    def follow(self):
+        while True:
+            lines = self.read_new_lines()
+            if lines:
+                yield lines
+            else:
+                time.sleep(self.poll_interval)
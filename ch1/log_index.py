@@ -0,0 +1,172 @@
+import hashlib
+import io
+import json
+import os
+import re
+from bisect import bisect_left
+from itertools import islice
+
+TOKEN_PATTERN = re.compile(r'\w+')
+FINGERPRINT_BLOCK = 4096
+
+
+def prefix_fingerprint(f, size):
+    # 색인한 앞부분(size 바이트)의 첫 블록과 마지막 블록 해시.
+    # 크기만 보면 같은 길이 이상으로 다시 쓴 파일을 이어 붙은 것으로 안다.
+    if not size:
+        return None
+    digest = hashlib.sha1()
+    f.seek(0)
+    digest.update(f.read(min(size, FINGERPRINT_BLOCK)))
+    f.seek(max(size - FINGERPRINT_BLOCK, 0))
+    digest.update(f.read(min(size, FINGERPRINT_BLOCK)))
+    return digest.hexdigest()
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def split_groups(terms):
+    # 공백으로 나눈 단어는 AND, 'OR'로 나눈 묶음끼리는 OR로 합친다.
+    groups = [[]]
+    for term in terms:
+        if term == 'OR':
+            groups.append([])
+        else:
+            groups[-1].append(term)
+    return [group for group in groups if group]
+
+
+def matches_terms(terms, events, message):
+    # 색인은 타임스탬프 단위라 같은 초의 다른 이벤트끼리 AND가 성립할 수
+    # 있다. 출력 전에 이벤트 하나의 토큰만으로 같은 조건을 다시 확인한다.
+    tokens = set(tokenize(events)) | set(tokenize(message))
+
+    def has_prefix(query):
+        return any(token.startswith(query) for token in tokens)
+
+    for group in split_groups(terms):
+        queries = [tokenize(term) for term in group]
+        if all(queries) and all(has_prefix(query) for term_queries in queries
+                                for query in term_queries):
+            return True
+    return False
+
+
+class InvertedIndex:
+    # 토큰 → 타임스탬프 집합. 로그 파일의 어디까지 색인했는지(offset)를
+    # 함께 저장해서 다음 실행 때는 새로 추가된 줄만 읽는다.
+    # 검색어는 대소문자를 가리지 않고 토큰의 앞부분과 비교한다('oxy' →
+    # 'oxygen'). 결과는 후보 타임스탬프이므로 출력할 때 matches_terms로
+    # 이벤트마다 다시 거른다.
+
+    def __init__(self, path):
+        self.path = path
+        self.offset = 0
+        self.fingerprint = None
+        self.postings = {}
+        self.vocabulary = None
+        self.dirty = False
+
+    @classmethod
+    def load(cls, path):
+        index = cls(path)
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            index.offset = data['offset']
+            index.fingerprint = data.get('fingerprint')
+            index.postings = {token: set(timestamps) for token, timestamps
+                              in data['postings'].items()}
+        return index
+
+    def save(self):
+        if not self.dirty:
+            return
+        data = {
+            'offset': self.offset,
+            'fingerprint': self.fingerprint,
+            'postings': {token: sorted(timestamps) for token, timestamps
+                         in self.postings.items()}
+        }
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        self.dirty = False
+
+    def reset(self):
+        self.offset = 0
+        self.fingerprint = None
+        self.postings = {}
+        self.vocabulary = None
+        self.dirty = True
+
+    def add(self, timestamp, events, message):
+        for token in set(tokenize(events)) | set(tokenize(message)):
+            self.postings.setdefault(token, set()).add(timestamp)
+        self.vocabulary = None
+        self.dirty = True
+
+    def update_from_log(self, log_file, parse_lines):
+        # 파일이 줄었거나 색인한 앞부분이 바뀌었으면 새 파일로 보고
+        # 처음부터 다시 색인한다.
+        with open(log_file, 'rb') as f:
+            if self.offset and (os.fstat(f.fileno()).st_size < self.offset
+                                or prefix_fingerprint(f, self.offset)
+                                != self.fingerprint):
+                self.reset()
+
+            f.seek(self.offset)
+            data = f.read()
+
+            # 아직 쓰는 중일 수 있는 마지막 미완성 줄은 다음 번에 읽는다.
+            end = data.rfind(b'\n') + 1
+            if not end:
+                return 0
+            fingerprint = prefix_fingerprint(f, self.offset + end)
+
+        lines = io.StringIO(data[:end].decode('utf-8'), newline=None)
+        count = 0
+        for timestamp, events, message in parse_lines(lines):
+            self.add(timestamp, events, message)
+            count += 1
+
+        self.offset += end
+        self.fingerprint = fingerprint
+        self.dirty = True
+        return count
+
+    def prefix_postings(self, query):
+        # 정렬한 토큰 목록에서 query로 시작하는 구간만 훑는다.
+        if self.vocabulary is None:
+            self.vocabulary = sorted(self.postings)
+        vocabulary = self.vocabulary
+        result = set()
+        for token in islice(vocabulary, bisect_left(vocabulary, query),
+                            None):
+            if not token.startswith(query):
+                break
+            result |= self.postings[token]
+        return result
+
+    def lookup(self, term):
+        tokens = tokenize(term)
+        if not tokens:
+            return set()
+        result = self.prefix_postings(tokens[0])
+        for token in tokens[1:]:
+            if not result:
+                break
+            result &= self.prefix_postings(token)
+        return result
+
+    def search(self, terms):
+        result = set()
+        for group in split_groups(terms):
+            matched = self.lookup(group[0])
+            for term in group[1:]:
+                if not matched:
+                    break
+                matched &= self.lookup(term)
+            result |= matched
+        return result
@@ -0,0 +1,99 @@
+import mmap
+import os
+
+BLOCK_SIZE = 8 * 2**20
+
+
+def keyword_needles(keywords):
+    # 바이트 단계 1차 필터용 검색어. 블록은 bytes.lower()로 ASCII만
+    # 소문자가 되므로, 그 밖의 대소문자 변형도 후보로 넣어 실제 일치를
+    # 놓치지 않게 한다. 최종 판정은 디코딩한 메시지로 다시 한다.
+    needles = set()
+    for keyword in keywords:
+        for variant in (keyword, keyword.lower(), keyword.upper(),
+                        keyword.capitalize()):
+            needles.add(variant.encode('utf-8').lower())
+    return sorted(needles)
+
+
+def in_time_range(mm, start, since, until):
+    timestamp = mm[start:start + 19]
+    if since is not None and timestamp < since:
+        return False
+    if until is not None and timestamp[:len(until)] > until:
+        return False
+    return True
+
+
+def iter_all_spans(mm):
+    size = len(mm)
+    start = 0
+    while start < size:
+        end = mm.find(b'\n', start)
+        if end == -1:
+            end = size
+        yield start, end
+        start = end + 1
+
+
+def block_end(mm, start, block_size):
+    size = len(mm)
+    end = start + block_size
+    if end >= size:
+        return size
+    newline = mm.rfind(b'\n', start, end)
+    if newline == -1:
+        newline = mm.find(b'\n', end)
+        return size if newline == -1 else newline + 1
+    return newline + 1
+
+
+def iter_keyword_spans(mm, needles, block_size=BLOCK_SIZE):
+    # 줄 경계에 맞춘 블록을 한 번에 소문자로 바꾼 뒤 bytes.find로 찾는다.
+    # 키워드가 없는 줄은 잘라내지도, 디코딩하지도 않는다.
+    start = 0
+    while start < len(mm):
+        end = block_end(mm, start, block_size)
+        block = mm[start:end].lower()
+
+        spans = set()
+        for needle in needles:
+            position = block.find(needle)
+            while position != -1:
+                line_start = block.rfind(b'\n', 0, position) + 1
+                line_end = block.find(b'\n', position)
+                if line_end == -1:
+                    line_end = len(block)
+                spans.add((line_start, line_end))
+                position = block.find(needle, line_end)
+
+        for line_start, line_end in sorted(spans):
+            yield start + line_start, start + line_end
+        start = end
+
+
+def iter_mmap_lines(filename, keywords=None, since=None, until=None):
+    since = since.encode('utf-8') if since else None
+    until = until.encode('utf-8') if until else None
+    try:
+        with open(filename, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if keywords:
+                    spans = iter_keyword_spans(mm, keyword_needles(keywords))
+                else:
+                    spans = iter_all_spans(mm)
+
+                for start, end in spans:
+                    if since or until:
+                        if not in_time_range(mm, start, since, until):
+                            continue
+                    yield mm[start:end].decode('utf-8')
+
+    except FileNotFoundError:
+        print(f'파일을 찾을 수 없습니다: {filename}')
+
+    except UnicodeDecodeError:
+        print('디코딩 오류: UTF-8 형식이 아닐 수 있습니다.')
@@ -0,0 +1,119 @@
+import json
+import os
+from bisect import bisect_left
+
+from log_index import prefix_fingerprint
+
+TIMESTAMP_LENGTH = 19
+
+
+def line_timestamp(line):
+    # 'YYYY-MM-DD HH:MM:SS,...' 형식의 줄만 색인 대상으로 본다.
+    if len(line) > TIMESTAMP_LENGTH and line[:1].isdigit():
+        return line[:TIMESTAMP_LENGTH].decode('utf-8', errors='replace')
+    return None
+
+
+class RangeIndex:
+    # step 줄마다 (타임스탬프, 바이트 오프셋)을 하나씩 기록하는 희소 색인.
+    # 시간순으로 쌓이는 로그라면 bisect로 시작 위치를 찾고, 그 뒤로는
+    # 범위를 벗어나는 첫 줄에서 읽기를 멈춘다.
+
+    def __init__(self, path, step=1024):
+        self.path = path
+        self.step = step
+        self.reset()
+
+    def reset(self):
+        self.timestamps = []
+        self.offsets = []
+        self.size = 0
+        self.lines = 0
+        self.last_timestamp = None
+        self.ordered = True
+        self.fingerprint = None
+
+    @classmethod
+    def load(cls, path, step=1024):
+        index = cls(path, step)
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            index.step = data['step']
+            index.size = data['size']
+            index.lines = data['lines']
+            index.last_timestamp = data['last_timestamp']
+            index.ordered = data['ordered']
+            index.fingerprint = data.get('fingerprint')
+            for timestamp, offset in data['entries']:
+                index.timestamps.append(timestamp)
+                index.offsets.append(offset)
+        return index
+
+    def save(self):
+        data = {
+            'step': self.step,
+            'size': self.size,
+            'lines': self.lines,
+            'last_timestamp': self.last_timestamp,
+            'ordered': self.ordered,
+            'fingerprint': self.fingerprint,
+            'entries': list(zip(self.timestamps, self.offsets)),
+        }
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+
+    def update(self, log_file):
+        # 이전에 색인한 위치부터 새로 붙은 완성된 줄만 읽는다.
+        # 파일이 줄었거나 색인한 앞부분이 바뀌었으면 처음부터 다시 만든다.
+        added = 0
+        with open(log_file, 'rb') as f:
+            if self.size and (os.fstat(f.fileno()).st_size < self.size
+                              or prefix_fingerprint(f, self.size)
+                              != self.fingerprint):
+                self.reset()
+
+            f.seek(self.size)
+            offset = self.size
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+
+                timestamp = line_timestamp(line)
+                if timestamp is not None:
+                    if (self.last_timestamp is not None
+                            and timestamp < self.last_timestamp):
+                        self.ordered = False
+                    if self.lines % self.step == 0:
+                        self.timestamps.append(timestamp)
+                        self.offsets.append(offset)
+                    self.lines += 1
+                    self.last_timestamp = timestamp
+                    added += 1
+
+                offset += len(line)
+            self.size = offset
+            self.fingerprint = prefix_fingerprint(f, self.size)
+        return added
+
+    def start_offset(self, since):
+        if since is None or not self.ordered:
+            return 0
+        # since보다 앞선 마지막 표본에서 시작해야 같은 시각의 줄을 놓치지 않는다.
+        position = bisect_left(self.timestamps, since)
+        return self.offsets[position - 1] if position else 0
+
+    def query(self, log_file, since=None, until=None):
+        with open(log_file, 'rb') as f:
+            f.seek(self.start_offset(since))
+            for line in f:
+                timestamp = line_timestamp(line)
+                if timestamp is None:
+                    continue
+                if since is not None and timestamp < since:
+                    continue
+                if until is not None and timestamp[:len(until)] > until:
+                    if self.ordered:
+                        break
+                    continue
+                yield line.decode('utf-8')
@@ -0,0 +1,79 @@
+import heapq
+import json
+import os
+import sys
+import tempfile
+from operator import itemgetter
+
+from log_store import timestamp_key
+
+MAX_OPEN_RUNS = 64
+
+
+def estimate_log_size(log):
+    return sys.getsizeof(log) + sum(sys.getsizeof(field) for field in log)
+
+
+def write_run(entries, tmp_dir):
+    fd, path = tempfile.mkstemp(prefix='mission_log_run_', suffix='.jsonl',
+                                dir=tmp_dir)
+    with open(fd, 'w', encoding='utf-8') as f:
+        for key, log in entries:
+            f.write(json.dumps([key, *log], ensure_ascii=False) + '\n')
+    return path
+
+
+def read_run(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            key, *log = json.loads(line)
+            yield key, log
+
+
+def merge_runs(paths, reverse):
+    readers = [read_run(path) for path in paths]
+    return heapq.merge(*readers, key=itemgetter(0), reverse=reverse)
+
+
+def external_sort_logs(logs, memory_budget, reverse=True, tmp_dir=None):
+    # memory_budget(바이트)만큼 모이면 정렬해서 임시 파일로 내보내고,
+    # 마지막에 k-way 병합한다. 정렬과 병합 모두 안정적이라
+    # 같은 시각의 로그는 입력 순서를 유지한다.
+    runs = []
+    chunk = []
+    used = 0
+    try:
+        for log in logs:
+            chunk.append((timestamp_key(log[0]), log))
+            used += estimate_log_size(log)
+            if used >= memory_budget:
+                chunk.sort(key=itemgetter(0), reverse=reverse)
+                runs.append(write_run(chunk, tmp_dir))
+                chunk = []
+                used = 0
+
+        chunk.sort(key=itemgetter(0), reverse=reverse)
+        if not runs:
+            for _, log in chunk:
+                yield log
+            return
+
+        if chunk:
+            runs.append(write_run(chunk, tmp_dir))
+        chunk = []
+
+        # 한 번에 열 수 있는 파일 수를 넘으면 앞쪽 run부터 묶어서 줄여 나간다.
+        while len(runs) > MAX_OPEN_RUNS:
+            group = runs[:MAX_OPEN_RUNS]
+            merged = write_run(merge_runs(group, reverse), tmp_dir)
+            for path in group:
+                os.remove(path)
+            runs = [merged] + runs[MAX_OPEN_RUNS:]
+
+        for _, log in merge_runs(runs, reverse):
+            yield log
+
+    finally:
+        for path in runs:
+            if os.path.exists(path):
+                os.remove(path)
@@ -0,0 +1,162 @@
+import sys
+from array import array
+from datetime import datetime, timedelta, timezone
+
+EPOCH = datetime(1970, 1, 1)
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+INVALID_SECONDS = -2**63
+
+
+def parse_timestamp(timestamp):
+    # 'YYYY-MM-DD HH:MM:SS' 형식만 받는다. fromisoformat은 시간대나 주 단위
+    # 날짜 같은 다른 ISO 형식도 받아들이므로, 다시 문자열로 만들어 원문과
+    # 같을 때만 정수로 바꾼다. 그래야 format_timestamp로 원문이 돌아온다.
+    moment = datetime.fromisoformat(timestamp)
+    if moment.isoformat(' ') != timestamp:
+        raise ValueError(f'invalid timestamp: {timestamp}')
+    delta = moment - EPOCH
+    return delta.days * 86400 + delta.seconds
+
+
+def timestamp_key(timestamp):
+    # (초, 마이크로초, 원문). 'T' 구분자, 소수 초, 시간대가 붙은 ISO 형식도
+    # 읽어서 초 아래 자리까지 비교한다. 읽을 수 없는 시각은 가장 오래된
+    # 쪽에 모으되 원문 문자열로 정렬해서 서로의 순서는 지킨다.
+    try:
+        return parse_timestamp(timestamp), 0, timestamp
+
+    except ValueError:
+        pass
+
+    try:
+        moment = datetime.fromisoformat(timestamp)
+
+    except ValueError:
+        return INVALID_SECONDS, 0, timestamp
+
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    delta = moment - EPOCH
+    return delta.days * 86400 + delta.seconds, delta.microseconds, timestamp
+
+
+def format_timestamp(seconds):
+    return (EPOCH + timedelta(seconds=seconds)).strftime(TIMESTAMP_FORMAT)
+
+
+class LogStore:
+    # 레코드마다 리스트를 두지 않고 열 단위 배열로 저장한다.
+    # 타임스탬프는 epoch 정수, 이벤트 레벨은 코드 배열 + 이름 표로 보관한다.
+    # 정수 열에는 'YYYY-MM-DD HH:MM:SS' 그대로인 시각만 넣는다. 그래야
+    # 꺼낼 때 원문과 같은 문자열로 돌아온다. 나머지는 INVALID_SECONDS를
+    # 넣고 원문을 raw_timestamps(행 번호 → 문자열)에 따로 둬서 행을
+    # 버리지도, 다른 시각으로 바꾸지도 않는다.
+    __slots__ = ('timestamps', 'levels', 'messages',
+                 'level_names', 'level_codes', 'raw_timestamps')
+
+    def __init__(self):
+        self.timestamps = array('q')
+        self.levels = array('H')
+        self.messages = []
+        self.level_names = []
+        self.level_codes = {}
+        self.raw_timestamps = {}
+
+    @classmethod
+    def from_logs(cls, logs):
+        store = cls()
+        for timestamp, events, message in logs:
+            store.append(timestamp, events, message)
+        return store
+
+    def level_code(self, events):
+        code = self.level_codes.get(events)
+        if code is None:
+            code = len(self.level_names)
+            self.level_names.append(sys.intern(events))
+            self.level_codes[events] = code
+        return code
+
+    def append(self, timestamp, events, message):
+        try:
+            seconds = parse_timestamp(timestamp)
+
+        except ValueError:
+            seconds = INVALID_SECONDS
+            self.raw_timestamps[len(self.messages)] = timestamp
+        self.timestamps.append(seconds)
+        self.levels.append(self.level_code(events))
+        self.messages.append(message)
+
+    def __len__(self):
+        return len(self.messages)
+
+    def timestamp(self, index):
+        seconds = self.timestamps[index]
+        if seconds == INVALID_SECONDS:
+            return self.raw_timestamps[index % len(self)]
+        return format_timestamp(seconds)
+
+    def __getitem__(self, index):
+        return [self.timestamp(index),
+                self.level_names[self.levels[index]],
+                self.messages[index]]
+
+    def __iter__(self):
+        level_names = self.level_names
+        raw_timestamps = self.raw_timestamps
+        last_seconds = None
+        timestamp = None
+        for index, (seconds, level, message) in enumerate(
+                zip(self.timestamps, self.levels, self.messages)):
+            if seconds == INVALID_SECONDS:
+                yield [raw_timestamps[index], level_names[level], message]
+                continue
+
+            # 같은 초가 이어지면 문자열 변환을 재사용한다.
+            if seconds != last_seconds:
+                timestamp = format_timestamp(seconds)
+                last_seconds = seconds
+            yield [timestamp, level_names[level], message]
+
+    def __repr__(self):
+        return repr(self.to_list())
+
+    def to_list(self):
+        return list(self)
+
+    def take(self, indices):
+        indices = list(indices)
+        store = LogStore()
+        store.level_names = self.level_names
+        store.level_codes = self.level_codes
+        store.timestamps = array('q', (self.timestamps[i] for i in indices))
+        store.levels = array('H', (self.levels[i] for i in indices))
+        store.messages = [self.messages[i] for i in indices]
+        if self.raw_timestamps:
+            store.raw_timestamps = {
+                position: self.raw_timestamps[i]
+                for position, i in enumerate(indices)
+                if i in self.raw_timestamps}
+        return store
+
+    def sort_key(self, index):
+        # 리스트 경로의 timestamp_key와 같은 키
+        seconds = self.timestamps[index]
+        if seconds == INVALID_SECONDS:
+            return timestamp_key(self.raw_timestamps[index])
+        return seconds, 0, format_timestamp(seconds)
+
+    def sorted_by_time(self, reverse=False):
+        # sorted()의 안정 정렬을 그대로 써서 리스트 정렬과 같은 순서를 낸다.
+        # 표준 시각만 있으면 같은 초는 같은 문자열이므로 정수만 비교해도 된다.
+        key = (self.sort_key if self.raw_timestamps
+               else self.timestamps.__getitem__)
+        order = sorted(range(len(self)), key=key, reverse=reverse)
+        return self.take(order)
+
+    def nbytes(self):
+        return (sys.getsizeof(self.timestamps) + sys.getsizeof(self.levels)
+                + sys.getsizeof(self.messages)
+                + sys.getsizeof(self.raw_timestamps)
+                + sum(sys.getsizeof(m) for m in self.messages))
@@ -0,0 +1,90 @@
+import bz2
+import gzip
+import lzma
+from json.encoder import encode_basestring
+
+FORMATS = ('pretty', 'json', 'ndjson')
+COMPRESSORS = {
+    'gzip': (gzip.open, '.gz'),
+    'bz2': (bz2.open, '.bz2'),
+    'xz': (lzma.open, '.xz'),
+}
+
+
+def output_filename(base, fmt='pretty', compress=None):
+    filename = base + ('.ndjson' if fmt == 'ndjson' else '.json')
+    if compress is not None:
+        filename += COMPRESSORS[compress][1]
+    return filename
+
+
+def open_output(filename, compress=None):
+    if compress is None:
+        return open(filename, 'w', encoding='utf-8')
+    opener = COMPRESSORS[compress][0]
+    return opener(filename, 'wt', encoding='utf-8')
+
+
+class LogJsonWriter:
+    # 항목을 받는 즉시 파일에 쓴다. pretty는 json.dump(indent=4)와 같은
+    # 모양, json은 공백 없는 한 줄, ndjson은 이벤트마다 한 줄씩 쓴다.
+    # pretty/json의 값은 이벤트가 하나여도 항상 배열이다(메모리의
+    # {타임스탬프: [이벤트, ...]}와 같은 모양). 같은 타임스탬프는
+    # write_group 한 번에 모아서 넘겨야 키가 중복되지 않는다.
+
+    def __init__(self, filename, fmt='pretty', compress=None):
+        if fmt not in FORMATS:
+            raise ValueError(f'지원하지 않는 형식: {fmt}')
+        self.fmt = fmt
+        self.count = 0
+        self.f = open_output(filename, compress)
+        if fmt != 'ndjson':
+            self.f.write('{')
+
+    def format_entry(self, events, message, indent):
+        events = encode_basestring(events)
+        message = encode_basestring(message)
+        if self.fmt == 'pretty':
+            inner = indent + '    '
+            return (f'{{\n{inner}"events": {events},\n'
+                    f'{inner}"message": {message}\n{indent}}}')
+        return f'{{"events":{events},"message":{message}}}'
+
+    def write(self, timestamp, events, message):
+        self.write_group(timestamp, [(events, message)])
+
+    def write_group(self, timestamp, entries):
+        key = encode_basestring(timestamp)
+
+        if self.fmt == 'ndjson':
+            for events, message in entries:
+                self.f.write(f'{{"timestamp":{key},'
+                             f'"events":{encode_basestring(events)},'
+                             f'"message":{encode_basestring(message)}}}\n')
+            self.count += 1
+            return
+
+        separator = ',' if self.count else ''
+        if self.fmt == 'pretty':
+            value = '[\n' + ',\n'.join(
+                '        ' + self.format_entry(*entry, '        ')
+                for entry in entries) + '\n    ]'
+            self.f.write(f'{separator}\n    {key}: {value}')
+        else:
+            value = '[' + ','.join(self.format_entry(*entry, '')
+                                   for entry in entries) + ']'
+            self.f.write(f'{separator}{key}:{value}')
+        self.count += 1
+
+    def close(self):
+        if self.fmt == 'pretty':
+            self.f.write('\n}' if self.count else '}')
+        elif self.fmt == 'json':
+            self.f.write('}')
+        self.f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -1,46 +1,139 @@
-import json
+import argparse
+import io
+import multiprocessing as mp
+import os
+from collections import Counter
+from itertools import groupby
+from operator import itemgetter
+
+from keyword_matcher import KeywordMatcher, load_keywords
+from log_analytics import analyze_logs, print_report
+from log_follow import LogFollower
+from log_index import InvertedIndex, matches_terms
+from log_mmap import iter_mmap_lines
+from log_range_index import RangeIndex
+from log_sort import external_sort_logs, timestamp_key
+from log_store import LogStore
+from log_writer import COMPRESSORS, FORMATS, LogJsonWriter, output_filename
 
 LOG_FILE = 'mission_computer_main.log'
-OUTPUT_FILE = 'mission_computer_main.json'
+OUTPUT_BASE = 'mission_computer_main'
+OUTPUT_FILE = OUTPUT_BASE + '.json'
+INDEX_FILE = 'mission_computer_main.index.json'
+RANGE_INDEX_FILE = LOG_FILE + '.idx'
 
 
-def read_log_file(filename):
+class LogReadError(Exception):
+    # 로그 파일을 끝까지 읽지 못했다. 원인은 이미 출력했으므로
+    # 받는 쪽은 이전 결과를 덮어쓰지 않고 멈추기만 하면 된다.
+    pass
+
+
+def iter_log_file(filename, echo=False):
+    # 한 줄씩 흘려보내므로 파일 크기와 무관하게 메모리 사용량이 일정하다.
+    # 중간에 실패하면 원인을 출력한 뒤 LogReadError를 낸다.
     try:
         with open(filename, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-            print('[전체 로그 내용]:')
-            for line in lines:
-                print(line.strip())
-            return lines
+            if echo:
+                print('[전체 로그 내용]:')
+            for line in f:
+                if echo:
+                    print(line.strip())
+                yield line
 
     except FileNotFoundError:
         print(f'파일을 찾을 수 없습니다: {filename}')
-        return []
+        raise LogReadError(filename) from None
 
     except UnicodeDecodeError:
         print('디코딩 오류: UTF-8 형식이 아닐 수 있습니다.')
-        return []
+        raise LogReadError(filename) from None
 
     except Exception as e:
         print(f'알 수 없는 오류 발생: {e}')
+        raise LogReadError(filename) from None
+
+
+def read_log_file(filename, echo=False):
+    # 일부만 읽힌 경우에도 예전처럼 빈 리스트를 돌려준다.
+    try:
+        return list(iter_log_file(filename, echo))
+
+    except LogReadError:
         return []
 
 
-def filter_danger_logs(log_list, output_file='filter_danger_logs.log'):
+DANGER_KEYWORDS = ('폭발', '누출', '고온', 'oxygen', 'unstable', 'explosion')
+DANGER_MATCHER = KeywordMatcher(DANGER_KEYWORDS)
+
+
+def build_danger_matcher(keyword_file=None):
+    if keyword_file is None:
+        return DANGER_MATCHER
+    return KeywordMatcher(load_keywords(keyword_file))
+
+
+def is_danger_log(log, matcher=DANGER_MATCHER):
+    return matcher.search(log[2])
+
+
+def format_log_line(log):
+    return ', '.join(map(str, log)) + '\n'
+
+
+def tee_danger_logs(logs, output_file='filter_danger_logs.log',
+                    matcher=DANGER_MATCHER):
+    # 모든 로그를 그대로 다음 단계로 넘기면서 위험 로그만 파일에 기록한다.
+    # 파일은 첫 위험 로그가 나왔을 때 열어서, 일괄 처리와 마찬가지로
+    # 위험 로그가 없으면 기존 파일을 건드리지 않는다. 임시 파일에 쓰다가
+    # 입력을 끝까지 읽었을 때만 바꿔 넣어서, 중간에 실패하면 이전 파일이 남는다.
+    temp_file = output_file + '.tmp'
+    f = None
+    count = 0
+    completed = False
+    try:
+        for log in logs:
+            if is_danger_log(log, matcher):
+                if f is None:
+                    f = open(temp_file, 'w', encoding='utf-8')
+                f.write(format_log_line(log))
+                count += 1
+            yield log
+        completed = True
+
+    finally:
+        if f is not None:
+            f.close()
+            if completed:
+                os.replace(temp_file, output_file)
+            else:
+                os.remove(temp_file)
+
+        if completed and count:
+            print(f'\n\n위험 로그 {count}개 저장 완료: {output_file}')
+        elif completed:
+            print('위험 키워드를 포함한 로그가 없습니다.')
+
+
+def filter_danger_logs(log_list, output_file='filter_danger_logs.log',
+                       matcher=DANGER_MATCHER):
     try:
-        danger_keywords = ('폭발', '누출', '고온', 'oxygen', 'unstable', 'explosion')
         danger_lines = []
+        keyword_hits = Counter()
         for line in log_list:
-            if any(keyword.lower() in line[2].lower()
-                   for keyword in danger_keywords):
+            hits = matcher.find(line[2])
+            if hits:
                 danger_lines.append(line)
+                keyword_hits.update(hits)
 
         if danger_lines:
             with open(output_file, 'w', encoding='utf-8') as f:
                 for d_line in danger_lines:
-                    f.write(', '.join(map(str, d_line)) + '\n')
+                    f.write(format_log_line(d_line))
 
             print(f'\n\n위험 로그 {len(danger_lines)}개 저장 완료: {output_file}')
+            print('키워드별 탐지: ' + ', '.join(
+                f'{k} {n}' for k, n in keyword_hits.most_common()))
         else:
             print('위험 키워드를 포함한 로그가 없습니다.')
 
@@ -48,8 +141,7 @@ def filter_danger_logs(log_list, output_file='filter_danger_logs.log'):
         print(f'오류 발생: {e}')
 
 
-def parse_log_lines(lines):
-    parsed = []
+def iter_parse_log_lines(lines, errors=None):
     for line in lines:
         line = line.strip()
 
@@ -61,67 +153,430 @@ def parse_log_lines(lines):
 
         try:
             timestamp, events, message = line.split(',', 2)
-            parsed.append([timestamp.strip(), events.strip(), message.strip()])
 
         except ValueError:
-            print(f'구문 오류 (구분자 누락 또는 필드 부족): {line}')
+            if errors is None:
+                report_parse_error(line)
+            else:
+                errors.append(line)
+            continue
+
+        yield [timestamp.strip(), events.strip(), message.strip()]
+
+
+def report_parse_error(line):
+    print(f'구문 오류 (구분자 누락 또는 필드 부족): {line}')
+
+
+def parse_log_lines(lines):
+    return list(iter_parse_log_lines(lines))
+
+
+def build_log_store(logs):
+    store = LogStore()
+    for log in logs:
+        store.append(*log)
+    return store
+
+
+def split_log_file(filename, chunks):
+    # 바이트 구간을 줄 경계에 맞춰 나눈다. 경계 바로 앞 바이트부터 한 줄을
+    # 버리면, 경계가 이미 줄 시작일 때도 그 줄을 건너뛰지 않는다.
+    size = os.path.getsize(filename)
+    offsets = [0]
+    with open(filename, 'rb') as f:
+        for i in range(1, chunks):
+            position = size * i // chunks
+            if position <= offsets[-1]:
+                continue
+            f.seek(position - 1)
+            f.readline()
+            offset = f.tell()
+            if offsets[-1] < offset < size:
+                offsets.append(offset)
+    offsets.append(size)
+    return [(filename, start, end)
+            for start, end in zip(offsets, offsets[1:])]
+
+
+def parse_log_chunk(chunk):
+    filename, start, end = chunk
+    with open(filename, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+
+    # newline=None으로 텍스트 모드 파일 읽기와 같은 줄 나눔을 따른다.
+    lines = io.StringIO(data.decode('utf-8'), newline=None)
+    errors = []
+    parsed = list(iter_parse_log_lines(lines, errors))
+    return parsed, errors
+
+
+def parse_log_file_parallel(filename, workers):
+    try:
+        chunks = split_log_file(filename, workers * 4)
+        with mp.Pool(workers) as pool:
+            results = pool.map(parse_log_chunk, chunks)
 
+    except FileNotFoundError:
+        print(f'파일을 찾을 수 없습니다: {filename}')
+        return []
+
+    except UnicodeDecodeError:
+        print('디코딩 오류: UTF-8 형식이 아닐 수 있습니다.')
+        return []
+
+    parsed = []
+    for chunk_logs, errors in results:
+        for line in errors:
+            report_parse_error(line)
+        parsed.extend(chunk_logs)
     return parsed
 
 
 def sort_logs_by_time(logs):
-    return sorted(logs, key=lambda x: x[0], reverse=True)
+    if isinstance(logs, LogStore):
+        return logs.sorted_by_time(reverse=True)
+    return sorted(logs, key=lambda x: timestamp_key(x[0]), reverse=True)
+
+
+class DuplicateReporter:
+    # 중복 경고는 처음 limit건만 출력하고 나머지는 요약으로 알린다.
 
+    def __init__(self, limit=5):
+        self.limit = limit
+        self.events = 0
+        self.timestamps = 0
+
+    def report(self, timestamp, first_duplicate):
+        self.events += 1
+        if first_duplicate:
+            self.timestamps += 1
+        if self.events <= self.limit:
+            print(f'중복 타임스탬프 감지: {timestamp}, 모든 이벤트를 보존합니다.')
+
+    def summary(self):
+        if self.events > self.limit:
+            print(f'중복 타임스탬프 이벤트 {self.events}건 '
+                  f'(타임스탬프 {self.timestamps}개), '
+                  f'처음 {self.limit}건만 표시했습니다.')
+
+
+def convert_to_dict_by_time(logs, reporter=None):
+    # 타임스탬프마다 이벤트 리스트를 두어 같은 시각의 로그도 잃지 않는다.
+    if reporter is None:
+        reporter = DuplicateReporter()
 
-def convert_to_dict_by_time(logs):
     result = {}
     for log in logs:
         timestamp, events, message = log
-
-        if timestamp in result:
-            print(f'중복 타임스탬프 감지: {timestamp}, 기존 메시지가 덮어쓰기 됩니다.')
-        result[timestamp] = {
+        entry = {
             'events': events,
             'message': message
         }
+
+        entries = result.get(timestamp)
+        if entries is None:
+            result[timestamp] = [entry]
+        else:
+            entries.append(entry)
+            reporter.report(timestamp, len(entries) == 2)
+
+    reporter.summary()
     return result
 
 
-def save_to_json(data, filename, keyword):
+def load_log_index(log_file=LOG_FILE, index_file=INDEX_FILE):
+    index = InvertedIndex.load(index_file)
+    index.update_from_log(log_file, iter_parse_log_lines)
+    index.save()
+    return index
+
+
+def load_range_index(log_file=LOG_FILE, index_file=RANGE_INDEX_FILE):
+    index = RangeIndex.load(index_file)
+    if index.update(log_file) or not os.path.exists(index_file):
+        index.save()
+    return index
+
+
+def save_to_json(data, filename, keyword, hits=None, fmt='pretty',
+                 compress=None):
     try:
-        if keyword:
+        if keyword and hits is not None:
+            search_data = {}
+            for k in sorted(hits, reverse=True):
+                entries = [entry for entry in data.get(k, ())
+                           if matches_terms(keyword, entry['events'],
+                                            entry['message'])]
+                if entries:
+                    search_data[k] = entries
+            print('\n[검색 결과]:')
+            print(search_data)
+
+        elif keyword:
             search_data = {
                 k: v for k, v in data.items()
-                if keyword[0] in v.get('events', '')
-                or keyword[0] in v.get('message', '')
+                if any(matches_keyword(entry['events'], entry['message'],
+                                       keyword) for entry in v)
             }
             print('\n[검색 결과]:')
             print(search_data)
 
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
+        with LogJsonWriter(filename, fmt, compress) as writer:
+            for timestamp, entries in data.items():
+                writer.write_group(timestamp, [
+                    (entry['events'], entry['message']) for entry in entries])
+
+        print(f'JSON 파일로 저장 완료: {filename}')
+
+    except Exception as e:
+        print(f'JSON 저장 오류: {e}')
+
 
+def matches_keyword(events, message, keyword):
+    return keyword[0] in events or keyword[0] in message
+
+
+def stream_to_json(logs, filename, keyword, hits=None, fmt='pretty',
+                   compress=None):
+    # 임시 파일에 쓰고 끝까지 성공했을 때만 바꿔 넣는다. 로그를 다 읽지
+    # 못했으면 이전 결과 파일을 그대로 둔다.
+    temp_file = filename + '.tmp'
+    count = 0
+    try:
+        if keyword:
+            print('\n[검색 결과]:')
+
+        with LogJsonWriter(temp_file, fmt, compress) as writer:
+            # pretty/json은 정렬된 입력만 받으므로 같은 시각의 로그가 붙어
+            # 있어서 한 키로 묶인다. ndjson은 묶음과 상관없이 한 줄씩 쓴다.
+            for timestamp, group in groupby(logs, key=itemgetter(0)):
+                entries = [(events, message) for _, events, message in group]
+                for events, message in entries:
+                    if hits is not None:
+                        matched = (timestamp in hits
+                                   and matches_terms(keyword, events, message))
+                    else:
+                        matched = keyword and matches_keyword(events, message,
+                                                              keyword)
+                    if matched:
+                        print({timestamp: {'events': events,
+                                           'message': message}})
+
+                writer.write_group(timestamp, entries)
+                count += len(entries)
+
+        os.replace(temp_file, filename)
         print(f'JSON 파일로 저장 완료: {filename}')
 
+    except LogReadError:
+        print(f'로그를 끝까지 읽지 못해 {filename}을(를) 바꾸지 않았습니다.')
+
     except Exception as e:
         print(f'JSON 저장 오류: {e}')
 
+    finally:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+
+    return count
+
+
+def run_stream_pipeline(keyword, echo=False, matcher=DANGER_MATCHER,
+                        memory_budget=None, hits=None, fmt='ndjson',
+                        compress=None):
+    # 읽기 → 파싱 → 위험 로그 필터 → JSON 저장을 한 번의 순회로 처리한다.
+    # memory_budget이 없으면 정렬 없이 파일 순서대로 ndjson으로 저장되고,
+    # 있으면 외부 병합 정렬로 메모리를 그 안에 묶어 둔 채 시간 역순으로
+    # 저장한다.
+    if memory_budget is None and fmt != 'ndjson':
+        raise ValueError('정렬하지 않는 스트리밍은 ndjson만 쓸 수 있습니다.')
+    lines = iter_log_file(LOG_FILE, echo)
+    logs = iter_parse_log_lines(lines)
+    logs = tee_danger_logs(logs, matcher=matcher)
+    if memory_budget is not None:
+        logs = external_sort_logs(logs, memory_budget)
+    filename = output_filename(OUTPUT_BASE, fmt, compress)
+    return stream_to_json(logs, filename, keyword, hits, fmt, compress)
+
+
+def run_follow(matcher=DANGER_MATCHER, output_file='filter_danger_logs.log',
+               from_start=False):
+    # 새로 들어온 줄만 파싱해서 위험 로그를 바로 덧붙인다.
+    print(f'{LOG_FILE} 감시 중... (Ctrl+C로 종료)')
+    follower = LogFollower(LOG_FILE, from_start)
+    count = 0
+    try:
+        with open(output_file, 'a', encoding='utf-8') as f:
+            for lines in follower.follow():
+                for log in iter_parse_log_lines(lines):
+                    if is_danger_log(log, matcher):
+                        f.write(format_log_line(log))
+                        print(f'[위험] {format_log_line(log).rstrip()}')
+                        count += 1
+                f.flush()
+
+    except KeyboardInterrupt:
+        print(f'\n감시 종료: 위험 로그 {count}개 추가됨 ({output_file})')
+
+    finally:
+        follower.close()
+
+    return count
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='화성 미션 컴퓨터 로그 분석')
+    parser.add_argument('--echo', action='store_true',
+                        help='읽은 로그 내용을 모두 출력')
+    parser.add_argument('--stream', action='store_true',
+                        help='정렬 없이 일정한 메모리로 스트리밍 처리')
+    parser.add_argument('--format', choices=FORMATS,
+                        help='JSON 저장 형식 (pretty, json, ndjson). '
+                             'pretty/json은 {타임스탬프: [이벤트, ...]}, '
+                             'ndjson은 이벤트마다 한 줄. 기본은 pretty, '
+                             '--memory-budget 없는 --stream은 ndjson')
+    parser.add_argument('--compress', choices=sorted(COMPRESSORS),
+                        help='저장 파일 압축 방식')
+    parser.add_argument('--memory-budget', type=float, metavar='MB',
+                        help='--stream 정렬에 쓸 메모리 한도(MB), 넘으면 '
+                             '임시 파일로 나눠 병합 정렬')
+    parser.add_argument('--keywords', metavar='FILE',
+                        help='위험 키워드 목록 파일 (한 줄에 하나, # 주석)')
+    parser.add_argument('--index', action='store_true',
+                        help='역색인으로 검색 (여러 단어 AND, OR 지원). '
+                             '대소문자 구분 없이 단어 앞부분으로 찾음 '
+                             '(기본 검색은 대소문자 구분 부분 문자열)')
+    parser.add_argument('--compact', action='store_true',
+                        help='파싱 결과를 열 단위 LogStore로 보관')
+    parser.add_argument('--stats', action='store_true',
+                        help='레벨별 시간대 분포, 위험 이벤트 간격, '
+                             '자주 나온 메시지 템플릿 출력')
+    parser.add_argument('--bucket', type=int, default=60, metavar='SECONDS',
+                        help='--stats 시간대 구간 길이(초)')
+    parser.add_argument('--mmap', action='store_true',
+                        help='로그 파일을 mmap으로 읽고 통과한 줄만 디코딩')
+    parser.add_argument('--since', metavar='TIMESTAMP',
+                        help='이 시각 이후 로그만 (예: "2023-08-27 10:05")')
+    parser.add_argument('--until', metavar='TIMESTAMP',
+                        help='이 시각까지의 로그만')
+    parser.add_argument('--range-index', action='store_true',
+                        help='--since/--until 조회에 시각→오프셋 희소 색인 사용')
+    parser.add_argument('--danger-only', action='store_true',
+                        help='--mmap에서 위험 키워드가 있는 줄만 읽음')
+    parser.add_argument('--follow', action='store_true',
+                        help='로그 파일을 계속 감시하며 위험 로그를 덧붙임')
+    parser.add_argument('--from-start', action='store_true',
+                        help='--follow 시작 시 기존 내용부터 검사')
+    parser.add_argument('--workers', type=int, default=1, metavar='N',
+                        help='N개 프로세스로 로그를 나눠 파싱')
+    args = parser.parse_args()
+
+    if args.memory_budget is not None:
+        if not args.stream:
+            parser.error('--memory-budget는 --stream과 함께 써야 합니다.')
+        if args.memory_budget <= 0:
+            parser.error('--memory-budget는 0보다 커야 합니다.')
+        args.memory_budget = int(args.memory_budget * 2**20)
+
+    # 정렬하지 않는 스트리밍에서는 같은 타임스탬프가 떨어져 나올 수 있어서
+    # pretty/json으로 쓰면 키가 중복된다. 이벤트마다 한 줄인 ndjson만 허용한다.
+    if args.stream and args.memory_budget is None:
+        if args.format not in (None, 'ndjson'):
+            parser.error('--memory-budget 없는 --stream은 --format ndjson만 '
+                         '쓸 수 있습니다.')
+        args.format = 'ndjson'
+    elif args.format is None:
+        args.format = 'pretty'
+
+    if args.bucket < 1:
+        parser.error('--bucket은 1 이상이어야 합니다.')
+    if args.stats and args.stream:
+        parser.error('--stats는 --stream과 함께 쓸 수 없습니다.')
+
+    if args.danger_only and not args.mmap:
+        parser.error('--danger-only는 --mmap과 함께 써야 합니다.')
+    if (args.since or args.until) and not (args.mmap or args.range_index):
+        parser.error('--since, --until은 --mmap 또는 --range-index와 함께 '
+                     '써야 합니다.')
+    if args.range_index and (args.mmap or args.stream or args.workers > 1):
+        parser.error('--range-index는 --mmap, --stream, --workers와 함께 '
+                     '쓸 수 없습니다.')
+    if args.mmap and (args.stream or args.workers > 1):
+        parser.error('--mmap은 --stream, --workers와 함께 쓸 수 없습니다.')
+
+    if args.workers < 1:
+        parser.error('--workers는 1 이상이어야 합니다.')
+    if args.workers > 1 and (args.stream or args.echo):
+        parser.error('--workers는 --stream, --echo와 함께 쓸 수 없습니다.')
+    return args
+
 
 def main():
+    args = parse_args()
     try:
+        if args.follow:
+            run_follow(build_danger_matcher(args.keywords),
+                       from_start=args.from_start)
+            return
+
         keyword = input('Search: ').strip().split()
-        if len(keyword) > 1:
+        if len(keyword) > 1 and not args.index:
             raise ValueError
-        lines = read_log_file(LOG_FILE)
 
-        if not lines:
+        matcher = build_danger_matcher(args.keywords)
+
+        hits = None
+        if keyword and args.index:
+            hits = load_log_index().search(keyword)
+
+        if args.stream:
+            run_stream_pipeline(keyword, args.echo, matcher,
+                                args.memory_budget, hits,
+                                args.format, args.compress)
+            return
+
+        if args.workers > 1:
+            log_list = parse_log_file_parallel(LOG_FILE, args.workers)
+            if args.compact:
+                log_list = build_log_store(log_list)
+        elif args.range_index:
+            index = load_range_index()
+            lines = index.query(LOG_FILE, args.since, args.until)
+            logs = iter_parse_log_lines(lines)
+            log_list = (build_log_store(logs) if args.compact
+                        else list(logs))
+        elif args.mmap:
+            keywords = matcher.keywords if args.danger_only else None
+            lines = iter_mmap_lines(LOG_FILE, keywords, args.since,
+                                    args.until)
+            logs = iter_parse_log_lines(lines)
+            if args.danger_only:
+                logs = (log for log in logs if is_danger_log(log, matcher))
+            log_list = (build_log_store(logs) if args.compact
+                        else list(logs))
+        elif args.compact:
+            lines = iter_log_file(LOG_FILE, args.echo)
+            log_list = build_log_store(iter_parse_log_lines(lines))
+        else:
+            lines = read_log_file(LOG_FILE, args.echo)
+
+            if not lines:
+                return
+
+            log_list = parse_log_lines(lines)
+
+        if not log_list:
             return
 
-        log_list = parse_log_lines(lines)
         print('\n[리스트 객체]:')
         print(log_list)
 
-        filter_danger_logs(log_list)
+        filter_danger_logs(log_list, matcher=matcher)
+
+        if args.stats:
+            print_report(analyze_logs(log_list, matcher, args.bucket))
 
         sorted_logs = sort_logs_by_time(log_list)
         print('\n[시간 역순 정렬 리스트]:')
@@ -135,11 +590,20 @@ def main():
         print('\n[사전 객체]:')
         print(log_dict)
 
-        save_to_json(log_dict, OUTPUT_FILE, keyword)
+        save_to_json(log_dict,
+                     output_filename(OUTPUT_BASE, args.format, args.compress),
+                     keyword, hits, args.format, args.compress)
 
     except ValueError:
         print('invalid input.')
 
+    except FileNotFoundError as e:
+        print(f'파일을 찾을 수 없습니다: {e.filename}')
+
+    except LogReadError:
+        # 원인은 iter_log_file에서 이미 출력했다.
+        pass
+
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,104 @@
+import hashlib
+import json
+import os
+
+FRESH = 'fresh'
+APPENDED = 'appended'
+CHANGED = 'changed'
+
+CHUNK_SIZE = 2**20
+
+
+def hash_file(path, size=None):
+    # 앞쪽 size 바이트까지의 해시와 전체 해시를 한 번 읽어서 같이 구한다.
+    digest = hashlib.sha256()
+    prefix = None
+    read = 0
+    with open(path, 'rb') as f:
+        while True:
+            if size is not None and prefix is None:
+                chunk = f.read(min(CHUNK_SIZE, size - read))
+                if read + len(chunk) == size:
+                    digest.update(chunk)
+                    read += len(chunk)
+                    prefix = digest.hexdigest()
+                    continue
+            else:
+                chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+            read += len(chunk)
+    return prefix, digest.hexdigest()
+
+
+class InventoryCache:
+    # 원본 CSV의 크기/mtime/해시를 매니페스트에 남겨 두고, 다음 실행에서
+    # 그대로면 stat 한 번으로 끝낸다. 뒤에 행만 붙었으면 붙은 바이트만 읽는다.
+    # 결과 파일도 크기/mtime을 같이 적어 두어서 다른 곳에서 덮어쓰면 알아챈다.
+
+    def __init__(self, source, manifest_path, rows_path):
+        self.source = source
+        self.manifest_path = manifest_path
+        self.rows_path = rows_path
+        self.manifest = None
+        if os.path.exists(manifest_path):
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                self.manifest = json.load(f)
+
+    def check(self):
+        stat = os.stat(self.source)
+        manifest = self.manifest
+        if manifest is None or not os.path.exists(self.rows_path):
+            _, digest = hash_file(self.source)
+            return CHANGED, stat, digest
+
+        if (stat.st_size == manifest['size']
+                and stat.st_mtime_ns == manifest['mtime_ns']):
+            return FRESH, stat, manifest['sha256']
+
+        old_size = manifest['size']
+        if stat.st_size >= old_size:
+            prefix, digest = hash_file(self.source, old_size)
+            if prefix == manifest['sha256']:
+                if stat.st_size == old_size:
+                    return FRESH, stat, digest
+                if manifest['ends_with_newline']:
+                    return APPENDED, stat, digest
+        else:
+            _, digest = hash_file(self.source)
+        return CHANGED, stat, digest
+
+    def output_matches(self, path):
+        outputs = (self.manifest or {}).get('outputs', {})
+        recorded = outputs.get(path)
+        if recorded is None or not os.path.exists(path):
+            return False
+        stat = os.stat(path)
+        return (stat.st_size == recorded['size']
+                and stat.st_mtime_ns == recorded['mtime_ns'])
+
+    def save(self, stat, digest, outputs=()):
+        with open(self.source, 'rb') as f:
+            f.seek(max(stat.st_size - 1, 0))
+            ends_with_newline = f.read(1) in (b'\n', b'')
+
+        self.manifest = {
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha256': digest,
+            'ends_with_newline': ends_with_newline,
+            'outputs': {},
+        }
+        for path in outputs:
+            output_stat = os.stat(path)
+            self.manifest['outputs'][path] = {
+                'size': output_stat.st_size,
+                'mtime_ns': output_stat.st_mtime_ns,
+            }
+        with open(self.manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=4)
+
+    @property
+    def cached_size(self):
+        return self.manifest['size']
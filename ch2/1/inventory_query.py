@@ -0,0 +1,216 @@
+import argparse
+import csv
+import re
+import time
+
+import numpy as np
+
+from inventory_table import OPERATORS, InventoryTable
+
+PREDICATE_PATTERN = re.compile(r'^(.+?)\s*(>=|<=|==|!=|>|<)\s*(\S+)$')
+AND_PATTERN = re.compile(r'\s+and\s+', re.IGNORECASE)
+
+
+class SortedIndex:
+    # 숫자 열 하나를 정렬해 둔 색인. 범위 조건은 searchsorted로 경계만 찾고
+    # 그 사이의 행 번호를 그대로 돌려준다.
+
+    def __init__(self, values, mask):
+        valid = np.flatnonzero(mask)
+        self.order = valid[np.argsort(values[valid], kind='stable')]
+        self.sorted_values = values[self.order]
+
+    def range(self, operator, threshold):
+        values = self.sorted_values
+        if operator == '>':
+            return self.order[np.searchsorted(values, threshold, 'right'):]
+        if operator == '>=':
+            return self.order[np.searchsorted(values, threshold, 'left'):]
+        if operator == '<':
+            return self.order[:np.searchsorted(values, threshold, 'left')]
+        if operator == '<=':
+            return self.order[:np.searchsorted(values, threshold, 'right')]
+        if operator == '==':
+            start = np.searchsorted(values, threshold, 'left')
+            end = np.searchsorted(values, threshold, 'right')
+            return self.order[start:end]
+        return None
+
+
+class InventoryQuery:
+
+    def __init__(self, table):
+        self.table = table
+        self.indexes = {}
+
+    def resolve(self, name):
+        # 'Weight'처럼 앞부분만 적어도 하나로 정해지면 그 열로 본다.
+        name = name.strip()
+        if name in self.table.header:
+            return name
+        matches = [column for column in self.table.header
+                   if column.lower().startswith(name.lower())]
+        if len(matches) != 1:
+            raise KeyError(f'열을 찾을 수 없습니다: {name}')
+        return matches[0]
+
+    def index(self, name):
+        index = self.indexes.get(name)
+        if index is None:
+            index = self.indexes[name] = SortedIndex(*self.table.column(name))
+        return index
+
+    def parse(self, query):
+        predicates = []
+        for part in AND_PATTERN.split(query.strip()):
+            match = PREDICATE_PATTERN.match(part.strip())
+            if match is None:
+                raise ValueError(f'조건을 해석할 수 없습니다: {part}')
+            name, operator, value = match.groups()
+            predicates.append((self.resolve(name), operator, float(value)))
+        return predicates
+
+    def where(self, query):
+        # 정렬 색인으로 각 범위 조건의 결과 구간을 찾고, 가장 좁은 구간의
+        # 행만 남긴 뒤 나머지 조건은 그 후보 행의 값에만 비교한다.
+        predicates = self.parse(query)
+        best = None
+        for position, (name, operator, threshold) in enumerate(predicates):
+            rows = self.index(name).range(operator, threshold)
+            if rows is None:
+                continue
+            if best is None or len(rows) < len(best[1]):
+                best = (position, rows)
+
+        if best is None:
+            ids = np.arange(len(self.table))
+            rest = predicates
+        else:
+            ids = np.sort(best[1])
+            rest = predicates[:best[0]] + predicates[best[0] + 1:]
+
+        for name, operator, threshold in rest:
+            values, mask = self.table.column(name)
+            keep = mask[ids] & OPERATORS[operator](values[ids], threshold)
+            ids = ids[keep]
+        return ids
+
+    def run(self, query, sort_by=None, descending=False, limit=None):
+        ids = self.where(query)
+        if sort_by is not None:
+            values, mask = self.table.column(self.resolve(sort_by))
+            valid = ids[mask[ids]]
+            keys = -values[valid] if descending else values[valid]
+            ids = np.concatenate([valid[np.argsort(keys, kind='stable')],
+                                  ids[~mask[ids]]])
+        if limit is not None:
+            ids = ids[:limit]
+        return ids
+
+
+def load_table(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        rows = [row for row in reader]
+    return InventoryTable(header, rows)
+
+
+def synthetic_table(n_rows, seed=0):
+    # 숫자 열은 배열로 바로 넣고, 행 문자열은 출력할 때만 쓰므로 짧게 만든다.
+    rng = np.random.default_rng(seed)
+    header = ['Substance', 'Weight (g/cm³)', 'Specific Gravity', 'Strength',
+              'Flammability']
+    table = InventoryTable(header, [[f'item-{i}'] for i in range(n_rows)])
+    weight = rng.uniform(0.001, 20.0, n_rows).round(3)
+    gravity = (weight * rng.uniform(0.9, 1.1, n_rows)).round(3)
+    flammability = rng.uniform(0.0, 1.0, n_rows).round(2)
+    various = rng.random(n_rows) < 0.05
+    weight[various] = np.nan
+    gravity[various] = np.nan
+    table.set_column('Weight (g/cm³)', weight, ~various)
+    table.set_column('Specific Gravity', gravity, ~various)
+    table.set_column('Flammability', flammability, np.ones(n_rows, bool))
+    return table
+
+
+def full_scan(table, predicates):
+    keep = np.ones(len(table), dtype=bool)
+    for name, operator, threshold in predicates:
+        keep &= table.compare(name, operator, threshold)
+    return np.flatnonzero(keep)
+
+
+def benchmark(n_rows, query, repeat=5):
+    table = synthetic_table(n_rows)
+    engine = InventoryQuery(table)
+    predicates = engine.parse(query)
+
+    start = time.perf_counter()
+    for name, _, _ in predicates:
+        engine.index(name)
+    build_time = time.perf_counter() - start
+
+    def best_of(func):
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = func()
+            times.append(time.perf_counter() - start)
+        return min(times), result
+
+    scan_time, expected = best_of(lambda: full_scan(table, predicates))
+    index_time, found = best_of(lambda: engine.where(query))
+    if not np.array_equal(expected, found):
+        raise AssertionError('색인 결과가 전체 스캔과 다릅니다.')
+
+    print(f'[인벤토리 질의] {n_rows:,}행, "{query}" → {len(found):,}행')
+    print(f'  색인 생성 {build_time:.3f}s (1회)')
+    print(f'  전체 스캔 {scan_time * 1000:.1f}ms, '
+          f'정렬 색인 {index_time * 1000:.1f}ms')
+
+
+def print_rows(table, ids):
+    print(table.header)
+    for row in table.take(ids):
+        print(row)
+    print(f'\n{len(ids)}행')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='인벤토리 다중 조건 질의')
+    parser.add_argument('query', nargs='?',
+                        help='예: "Flammability > 0.5 and '
+                             'Specific Gravity < 1.0"')
+    parser.add_argument('--sort', metavar='COLUMN', help='정렬 기준 열')
+    parser.add_argument('--desc', action='store_true', help='내림차순 정렬')
+    parser.add_argument('--limit', type=int, metavar='N', help='최대 행 수')
+    parser.add_argument('--input',
+                        default='mars_base/Mars_Base_Inventory_List.csv')
+    parser.add_argument('--benchmark', type=int, metavar='ROWS',
+                        help='합성 인벤토리 ROWS행으로 벤치마크 (예: 5000000)')
+    args = parser.parse_args()
+
+    try:
+        if args.benchmark:
+            benchmark(args.benchmark, args.query
+                      or 'Flammability > 0.5 and Specific Gravity < 1.0')
+            return
+
+        if not args.query:
+            parser.error('질의가 필요합니다.')
+
+        table = load_table(args.input)
+        engine = InventoryQuery(table)
+        ids = engine.run(args.query, args.sort, args.desc, args.limit)
+        print_rows(table, ids)
+
+    except FileNotFoundError as e:
+        print(e)
+
+    except (KeyError, ValueError) as e:
+        print(f'invalid query: {e}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,200 @@
+import math
+import mmap
+import struct
+from array import array
+
+MAGIC = b'MINV'
+VERSION = 1
+HEADER = struct.Struct('<4sHHQ')
+COLUMN = struct.Struct('<BQQQ')
+
+KIND_FLOAT = 0
+KIND_STRING = 1
+
+
+def parse_float(cell):
+    try:
+        return float(cell)
+
+    except ValueError:
+        return None
+
+
+def is_numeric_column(cells):
+    numeric = sum(1 for cell in cells if parse_float(cell) is not None)
+    return numeric * 2 >= len(cells) and numeric > 0
+
+
+def encode_float_column(cells):
+    # 숫자는 float64 배열에 넣는다. 'Various'처럼 숫자가 아니거나 '0'처럼
+    # repr로 되돌렸을 때 원문과 달라지는 칸은 원문을 사전 코드로 따로 둔다.
+    values = array('d')
+    codes = array('I')
+    strings = []
+    lookup = {}
+    for cell in cells:
+        value = parse_float(cell)
+        if value is not None and repr(value) == cell:
+            values.append(value)
+            codes.append(0)
+            continue
+
+        values.append(math.nan if value is None else value)
+        code = lookup.get(cell)
+        if code is None:
+            strings.append(cell)
+            code = lookup[cell] = len(strings)
+        codes.append(code)
+    return values, codes, strings
+
+
+def encode_string_column(cells):
+    codes = array('I')
+    strings = []
+    lookup = {}
+    for cell in cells:
+        code = lookup.get(cell)
+        if code is None:
+            code = lookup[cell] = len(strings)
+            strings.append(cell)
+        codes.append(code)
+    return codes, strings
+
+
+def encode_strings(strings):
+    parts = [struct.pack('<I', len(strings))]
+    for string in strings:
+        encoded = string.encode('utf-8')
+        parts.append(struct.pack('<I', len(encoded)))
+        parts.append(encoded)
+    return b''.join(parts)
+
+
+def write_columnar(path, header, data):
+    # [헤더][열 디렉터리][열 블록...] 순서. 디렉터리에 각 블록의 오프셋이
+    # 있어서 읽을 때는 필요한 열의 블록만 건드린다.
+    n_rows = len(data)
+    directory_size = sum(2 + len(name.encode('utf-8')) + COLUMN.size
+                         for name in header)
+    offset = HEADER.size + directory_size
+    blocks = []
+    entries = []
+
+    def add_block(payload):
+        nonlocal offset
+        padding = -offset % 8
+        blocks.append(b'\0' * padding + payload)
+        start = offset + padding
+        offset = start + len(payload)
+        return start
+
+    for index, name in enumerate(header):
+        cells = [row[index] for row in data]
+        if is_numeric_column(cells):
+            values, codes, strings = encode_float_column(cells)
+            entries.append((name, KIND_FLOAT, add_block(values.tobytes()),
+                            add_block(codes.tobytes()),
+                            add_block(encode_strings(strings))))
+        else:
+            codes, strings = encode_string_column(cells)
+            entries.append((name, KIND_STRING, 0, add_block(codes.tobytes()),
+                            add_block(encode_strings(strings))))
+
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(header), n_rows))
+        for name, kind, data_offset, codes_offset, dict_offset in entries:
+            encoded = name.encode('utf-8')
+            f.write(struct.pack('<H', len(encoded)) + encoded)
+            f.write(COLUMN.pack(kind, data_offset, codes_offset, dict_offset))
+        for block in blocks:
+            f.write(block)
+
+
+class ColumnarInventory:
+    # mmap으로 파일을 열고 헤더와 열 디렉터리만 읽는다.
+    # 열 데이터는 요청한 열만 메모리 맵에서 바로 꺼낸다.
+
+    def __init__(self, path):
+        self.f = open(path, 'rb')
+        self.mm = mmap.mmap(self.f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, n_cols, self.n_rows = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f'열 단위 인벤토리 파일이 아닙니다: {path}')
+
+        self.header = []
+        self.columns = {}
+        position = HEADER.size
+        for _ in range(n_cols):
+            (length,) = struct.unpack_from('<H', self.mm, position)
+            position += 2
+            name = bytes(self.mm[position:position + length]).decode('utf-8')
+            position += length
+            self.header.append(name)
+            self.columns[name] = COLUMN.unpack_from(self.mm, position)
+            position += COLUMN.size
+
+    def close(self):
+        self.mm.close()
+        self.f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def kind(self, name):
+        return self.columns[name][0]
+
+    def read_strings(self, offset):
+        (count,) = struct.unpack_from('<I', self.mm, offset)
+        position = offset + 4
+        strings = []
+        for _ in range(count):
+            (length,) = struct.unpack_from('<I', self.mm, position)
+            position += 4
+            strings.append(
+                bytes(self.mm[position:position + length]).decode('utf-8'))
+            position += length
+        return strings
+
+    def read_array(self, offset, typecode):
+        values = array(typecode)
+        values.frombytes(self.mm[offset:offset + values.itemsize
+                                 * self.n_rows])
+        return values
+
+    def float_column(self, name):
+        kind, data_offset, _, _ = self.columns[name]
+        if kind != KIND_FLOAT:
+            raise ValueError(f'숫자 열이 아닙니다: {name}')
+        return self.read_array(data_offset, 'd')
+
+    def float_view(self, name):
+        # 복사 없이 메모리 맵을 그대로 보여 준다. 닫기 전에 release() 해야 한다.
+        kind, data_offset, _, _ = self.columns[name]
+        if kind != KIND_FLOAT:
+            raise ValueError(f'숫자 열이 아닙니다: {name}')
+        end = data_offset + 8 * self.n_rows
+        return memoryview(self.mm)[data_offset:end].cast('d')
+
+    def text_column(self, name):
+        kind, data_offset, codes_offset, dict_offset = self.columns[name]
+        codes = self.read_array(codes_offset, 'I')
+        strings = self.read_strings(dict_offset)
+        if kind == KIND_STRING:
+            return [strings[code] for code in codes]
+
+        values = self.read_array(data_offset, 'd')
+        return [strings[code - 1] if code else repr(value)
+                for value, code in zip(values, codes)]
+
+    def rows(self):
+        columns = [self.text_column(name) for name in self.header]
+        return [list(row) for row in zip(*columns)]
+
+
+def is_columnar_file(path):
+    with open(path, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
@@ -0,0 +1,73 @@
+import numpy as np
+
+OPERATORS = {
+    '>': np.greater,
+    '>=': np.greater_equal,
+    '<': np.less,
+    '<=': np.less_equal,
+    '==': np.equal,
+    '!=': np.not_equal,
+}
+
+
+class InventoryTable:
+    # 문자열 행은 출력용으로 그대로 두고, 숫자 열은 처음 쓸 때 한 번만
+    # float64 배열로 바꿔 둔다. 숫자가 아닌 칸은 mask가 False다.
+
+    def __init__(self, header, rows):
+        self.header = list(header)
+        self.rows = rows
+        self.numeric = {}
+
+    def __len__(self):
+        return len(self.rows)
+
+    def column_index(self, name):
+        try:
+            return self.header.index(name)
+
+        except ValueError:
+            raise KeyError(f'없는 열입니다: {name}') from None
+
+    def set_column(self, name, values, mask):
+        self.numeric[name] = (np.asarray(values, dtype=np.float64),
+                              np.asarray(mask, dtype=bool))
+
+    def column(self, name):
+        cached = self.numeric.get(name)
+        if cached is not None:
+            return cached
+
+        index = self.column_index(name)
+        values = np.empty(len(self.rows), dtype=np.float64)
+        mask = np.ones(len(self.rows), dtype=bool)
+        for i, row in enumerate(self.rows):
+            try:
+                values[i] = float(row[index])
+
+            except ValueError:
+                values[i] = np.nan
+                mask[i] = False
+
+        self.numeric[name] = (values, mask)
+        return values, mask
+
+    def argsort(self, name, descending=False):
+        # 같은 값은 원래 순서를 지키고(list.sort와 같음),
+        # 숫자가 아닌 행은 맨 뒤에 원래 순서대로 둔다.
+        values, mask = self.column(name)
+        valid = np.flatnonzero(mask)
+        keys = -values[valid] if descending else values[valid]
+        ordered = valid[np.argsort(keys, kind='stable')]
+        return np.concatenate([ordered, np.flatnonzero(~mask)])
+
+    def compare(self, name, operator, threshold):
+        values, mask = self.column(name)
+        return mask & OPERATORS[operator](values, threshold)
+
+    def take(self, indices):
+        return [self.rows[i] for i in indices.tolist()]
+
+    def invalid_rows(self, name):
+        _, mask = self.column(name)
+        return self.take(np.flatnonzero(~mask))
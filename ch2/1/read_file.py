@@ -1,6 +1,15 @@
+import argparse
 import csv
+import heapq
+import io
+import os
 import pickle
 
+from inventory_store import (ColumnarInventory, is_columnar_file, parse_float,
+                             write_columnar)
+from inventory_cache import APPENDED, FRESH, InventoryCache
+from inventory_table import InventoryTable
+
 
 def read_csv(path):
     with open(path, 'r', encoding='utf-8') as f:
@@ -23,35 +32,179 @@ def save_csv(path, header, data):
 
 
 def save_bin(path, header, data):
-    with open(path, 'wb') as f:
-        pickle.dump((header, data), f)
+    write_columnar(path, header, data)
 
 
 def open_bin(path):
-    with open(path, 'rb') as f:
-        loaded_header, loaded_data = pickle.load(f)
+    if not is_columnar_file(path):
+        # 예전 pickle 형식으로 저장된 파일도 그대로 읽는다.
+        with open(path, 'rb') as f:
+            loaded_header, loaded_data = pickle.load(f)
+
+        return loaded_header, loaded_data
+
+    with ColumnarInventory(path) as inventory:
+        return inventory.header, inventory.rows()
 
-    return loaded_header, loaded_data
+
+def stream_danger_csv(input_path, output_path, column='Flammability',
+                      threshold=0.7, sort=False, top_k=None):
+    # 읽으면서 바로 걸러 쓴다. 정렬이 필요하면 위험 항목만 힙에 담고,
+    # top_k가 있으면 힙 크기를 그 안으로 묶어 둔다.
+    with open(input_path, 'r', encoding='utf-8') as f, \
+            open(output_path, 'w', newline='', encoding='utf-8') as out_csv:
+        reader = csv.reader(f)
+        header = next(reader)
+        column_index = header.index(column)
+
+        writer = csv.writer(out_csv)
+        writer.writerow(header)
+
+        if not sort:
+            count = 0
+            for row in reader:
+                value = parse_float(row[column_index])
+                if value is not None and value >= threshold:
+                    writer.writerow(row)
+                    count += 1
+            return count
+
+        # (값, -순번)으로 비교해서 같은 값은 먼저 읽은 행이 앞에 오게 한다.
+        heap = []
+        for seq, row in enumerate(reader):
+            value = parse_float(row[column_index])
+            if value is None or value < threshold:
+                continue
+
+            item = (value, -seq, row)
+            if top_k is None or len(heap) < top_k:
+                heapq.heappush(heap, item)
+            elif item > heap[0]:
+                heapq.heapreplace(heap, item)
+
+        heap.sort(reverse=True)
+        writer.writerows(row for _, _, row in heap)
+        return len(heap)
+
+
+def read_csv_from(path, offset):
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        text = f.read().decode('utf-8')
+    return [row for row in csv.reader(io.StringIO(text)) if row]
+
+
+def derive_outputs(header, data, output_file, bin_file, write_danger=True):
+    table = InventoryTable(header, data)
+    order = table.argsort('Flammability', descending=True)
+    if write_danger:
+        is_danger = table.compare('Flammability', '>=', 0.7)
+        save_csv(output_file, header, table.take(order[is_danger[order]]))
+    save_bin(bin_file, header, table.take(order))
+
+
+def run_cached(input_file, output_file, bin_file):
+    # 파싱 결과(원본 순서)는 열 단위 캐시 파일에 두고 매니페스트로 원본과
+    # 맞춰 본다. 변경이 없으면 stat만 하고, 행이 덧붙었으면 붙은 행만 파싱한다.
+    base = os.path.splitext(input_file)[0]
+    cache = InventoryCache(input_file, base + '.cache.json',
+                           base + '.cache.bin')
+    status, stat, digest = cache.check()
+    outputs = [output_file, bin_file]
+    danger_matches = cache.output_matches(output_file)
+
+    if status == FRESH:
+        if danger_matches and cache.output_matches(bin_file):
+            if stat.st_mtime_ns != cache.manifest['mtime_ns']:
+                cache.save(stat, digest, outputs)
+            print('원본 변경 없음: 기존 결과를 그대로 사용합니다.')
+            return
+
+        # 원본은 그대로인데 결과 파일이 없거나 다른 곳에서 바뀌었다.
+        header, data = open_bin(cache.rows_path)
+        write_danger = True
+        print('결과 파일이 바뀌어 캐시된 행으로 다시 만듭니다.')
+    elif status == APPENDED:
+        header, data = open_bin(cache.rows_path)
+        new_rows = read_csv_from(input_file, cache.cached_size)
+        data.extend(new_rows)
+
+        # 새 행에 위험 항목이 없으면 위험 목록 CSV는 다시 쓸 필요가 없다.
+        new_table = InventoryTable(header, new_rows)
+        write_danger = (not danger_matches or bool(
+            new_table.compare('Flammability', '>=', 0.7).any()))
+        print(f'추가된 행 {len(new_rows)}개만 파싱했습니다.')
+    else:
+        with open(input_file, 'r', encoding='utf-8') as f:
+            reader = csv.reader(f)
+            header = next(reader)
+            data = [row for row in reader]
+        write_danger = True
+        print(f'원본 전체 {len(data)}행을 파싱했습니다.')
+
+    derive_outputs(header, data, output_file, bin_file, write_danger)
+    save_bin(cache.rows_path, header, data)
+    cache.save(stat, digest, outputs)
+    print(f'결과 저장 완료: {bin_file}'
+          + (f', {output_file}' if write_danger else ''))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='화성 기지 인벤토리 분석')
+    parser.add_argument('--stream', action='store_true',
+                        help='전체를 메모리에 올리지 않고 위험 항목만 바로 저장')
+    parser.add_argument('--sort', action='store_true',
+                        help='--stream에서 인화성 지수 내림차순으로 저장')
+    parser.add_argument('--top-k', type=int, metavar='K',
+                        help='--stream --sort에서 상위 K개만 저장')
+    parser.add_argument('--cache', action='store_true',
+                        help='원본이 바뀌지 않았으면 이전 결과를 재사용')
+    args = parser.parse_args()
+
+    if args.cache and args.stream:
+        parser.error('--cache는 --stream과 함께 쓸 수 없습니다.')
+    if (args.sort or args.top_k is not None) and not args.stream:
+        parser.error('--sort, --top-k는 --stream과 함께 써야 합니다.')
+    if args.top_k is not None:
+        if args.top_k < 1:
+            parser.error('--top-k는 1 이상이어야 합니다.')
+        args.sort = True
+    return args
 
 
 def main():
+    args = parse_args()
     try:
         input_file = 'mars_base/Mars_Base_Inventory_List.csv'
         output_file = 'mars_base/Mars_Base_Inventory_danger.csv'
         bin_file = 'mars_base/Mars_Base_Inventory_List.bin'
 
+        if args.stream:
+            count = stream_danger_csv(input_file, output_file,
+                                      sort=args.sort, top_k=args.top_k)
+            print(f'인화성 지수 0.7 이상 위험 항목 {count}개 저장: {output_file}')
+            return
+
+        if args.cache:
+            run_cached(input_file, output_file, bin_file)
+            return
+
         header, data = read_csv(input_file)
 
-        flammability_index_col = header.index('Flammability')
-        data.sort(key=lambda row:
-                  float(row[flammability_index_col]), reverse=True)
+        table = InventoryTable(header, data)
+        order = table.argsort('Flammability', descending=True)
+        data = table.take(order)
 
         print('\n내림차순 정렬:')
         for row in data:
             print(row)
 
-        danger_items = [row for row in data
-                        if float(row[flammability_index_col]) >= 0.7]
+        invalid = table.invalid_rows('Flammability')
+        if invalid:
+            print(f'\n인화성 지수가 숫자가 아닌 항목 {len(invalid)}개 (맨 뒤로 정렬)')
+
+        is_danger = table.compare('Flammability', '>=', 0.7)
+        danger_items = table.take(order[is_danger[order]])
 
         print('\n인화성 지수 0.7 이상 위험 항목:')
         for row in danger_items:
@@ -71,7 +224,7 @@ def main():
     except FileNotFoundError as e:
         print(e)
 
-    except ValueError:
+    except (KeyError, ValueError):
         print('invalid file')
 
 
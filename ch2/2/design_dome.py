@@ -1,25 +1,85 @@
+import argparse
+import csv
+import json
 import math
+from functools import lru_cache
+
+import numpy as np
+
+from result_store import ResultFileError, ResultStore
 
 GRAVITY_MARS = 0.38
+DENSITIES = {'glass': 2.4, 'aluminum': 2.7, 'carbon_steel': 7.85}
+CACHE_SIZE = 4096
+RESULT_FIELDS = ['재질', '지름', '두께', '면적', '무게']
+SPEC_FIELDS = {
+    'diameter': ('diameter', '지름'),
+    'material': ('material', '재질'),
+    'thickness': ('thickness', '두께'),
+}
 
-sphere_results = []
+# 재질별 밀도(kg/m³). 재질 표가 바뀔 때만 다시 만든다.
+MATERIAL_DENSITY = {name: density * 1000
+                    for name, density in DENSITIES.items()}
 
+RESULT_CAP = 1000
+
+sphere_results = ResultStore(RESULT_CAP)
 
-def sphere_area(diameter, material, thickness):
-    densities = {'glass': 2.4, 'aluminum': 2.7, 'carbon_steel': 7.85}
-    density = densities[material]
+
+def dome_values(diameter, material, thickness):
+    density = MATERIAL_DENSITY[material]
 
     radius = diameter / 2
     area = 2 * math.pi * radius ** 2
     thickness_m = thickness / 100  # cm → m
     volume = area * thickness_m
 
-    density = densities[material] * 1000
     mass = volume * density
     weight_on_mars = mass * GRAVITY_MARS
 
-    area_rounded = round(area, 3)
-    weight_rounded = round(weight_on_mars, 3)
+    return round(area, 3), round(weight_on_mars, 3)
+
+
+cached_dome_values = lru_cache(maxsize=CACHE_SIZE)(dome_values)
+
+
+def set_cache_size(maxsize):
+    global cached_dome_values
+    cached_dome_values = lru_cache(maxsize=maxsize)(dome_values)
+
+
+def set_materials(densities):
+    # 재질 표를 통째로 바꾸고, 이전 밀도로 계산한 캐시는 버린다.
+    DENSITIES.clear()
+    DENSITIES.update(densities)
+    MATERIAL_DENSITY.clear()
+    MATERIAL_DENSITY.update((name, density * 1000)
+                            for name, density in DENSITIES.items())
+    cached_dome_values.cache_clear()
+
+
+def load_materials(path):
+    # 'material,density' 헤더가 있는 CSV. 밀도 단위는 g/cm³.
+    densities = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        for row in reader:
+            if not row or not row[0].strip():
+                continue
+            density = float(row[1])
+            if density <= 0:
+                raise ValueError(f'밀도가 올바르지 않습니다: {row[0]}')
+            densities[row[0].strip()] = density
+    if not densities:
+        raise ValueError(f'재질이 없습니다: {path}')
+    return densities
+
+
+def sphere_area(diameter, material, thickness):
+    area_rounded, weight_rounded = cached_dome_values(diameter, material,
+                                                      thickness)
 
     result = {
             '재질': material,
@@ -35,16 +95,210 @@ def sphere_area(diameter, material, thickness):
           f', 면적 ⇒ {area_rounded}, 무게 ⇒ {weight_rounded} kg')
 
 
+def material_densities(materials):
+    # 재질 문자열 배열을 고유값 단위로 한 번만 찾아서 밀도 배열로 펼친다.
+    names, inverse = np.unique(np.asarray(materials), return_inverse=True)
+    table = np.array([DENSITIES[name] for name in names.tolist()])
+    return table[inverse.reshape(-1)]
+
+
+def sphere_area_batch(diameters, materials, thicknesses=1.0, rounded=True):
+    # sphere_area와 같은 순서로 계산해서 같은 값을 낸다.
+    # materials가 재질 이름 하나면 모든 지름에 같은 재질을 쓴다.
+    diameters = np.asarray(diameters, dtype=np.float64)
+    thicknesses = np.broadcast_to(
+        np.asarray(thicknesses, dtype=np.float64), diameters.shape)
+    if isinstance(materials, str):
+        densities = np.full(diameters.shape, DENSITIES[materials])
+    else:
+        densities = material_densities(materials).reshape(diameters.shape)
+
+    radius = diameters / 2
+    area = 2 * math.pi * radius ** 2
+    volume = area * (thicknesses / 100)
+    mass = volume * (densities * 1000)
+    weight_on_mars = mass * GRAVITY_MARS
+
+    if rounded:
+        return np.round(area, 3), np.round(weight_on_mars, 3)
+    return area, weight_on_mars
+
+
+def export_batch(path, diameters, materials, thicknesses, area, weight):
+    diameters = np.asarray(diameters, dtype=np.float64)
+    count = diameters.shape[0]
+    materials = np.broadcast_to(np.asarray(materials, dtype=str), (count,))
+    thicknesses = np.broadcast_to(
+        np.asarray(thicknesses, dtype=np.float64), (count,))
+
+    if path.endswith('.npy'):
+        records = np.empty(count, dtype=[
+            ('material', materials.dtype), ('diameter', 'f8'),
+            ('thickness', 'f8'), ('area', 'f8'), ('weight', 'f8')])
+        records['material'] = materials
+        records['diameter'] = diameters
+        records['thickness'] = thicknesses
+        records['area'] = area
+        records['weight'] = weight
+        np.save(path, records)
+        return
+
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['재질', '지름', '두께', '면적', '무게'])
+        writer.writerows(zip(materials.tolist(), diameters.tolist(),
+                             thicknesses.tolist(), area.tolist(),
+                             weight.tolist()))
+
+
+def spec_field(record, name):
+    for key in SPEC_FIELDS[name]:
+        value = record.get(key)
+        if value not in (None, ''):
+            return value
+    return None
+
+
+def parse_spec(record):
+    # 대화형 입력과 같은 규칙: 지름은 0이 아니어야 하고 두께 기본값은 1.0.
+    # inf/nan은 계산해도 의미 없는 값이 나오므로 잘못된 입력으로 본다.
+    diameter = float(spec_field(record, 'diameter'))
+    if diameter == 0 or not math.isfinite(diameter):
+        raise ValueError
+    material = spec_field(record, 'material')
+    if material not in DENSITIES:
+        raise KeyError(material)
+    thickness = spec_field(record, 'thickness')
+    thickness = 1.0 if thickness is None else float(thickness)
+    if not math.isfinite(thickness):
+        raise ValueError
+    return diameter, material, thickness
+
+
+def is_ndjson(path):
+    return path.endswith(('.ndjson', '.jsonl'))
+
+
+def iter_specs(path):
+    # (줄 번호, 레코드)를 하나씩 낸다. 파일 전체를 읽어 두지 않는다.
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        if is_ndjson(path):
+            for line_no, line in enumerate(f, 1):
+                if line.strip():
+                    yield line_no, line
+            return
+
+        reader = csv.DictReader(f)
+        for record in reader:
+            yield reader.line_num, record
+
+
+def run_batch(input_path, output_path):
+    written = 0
+    errors = 0
+    with open(output_path, 'w', encoding='utf-8', newline='') as out:
+        if is_ndjson(output_path):
+            def write(result):
+                out.write(json.dumps(result, ensure_ascii=False) + '\n')
+        else:
+            writer = csv.DictWriter(out, fieldnames=RESULT_FIELDS)
+            writer.writeheader()
+            write = writer.writerow
+
+        for line_no, record in iter_specs(input_path):
+            try:
+                if isinstance(record, str):
+                    record = json.loads(record)
+                diameter, material, thickness = parse_spec(record)
+                # 지름이 너무 크면 제곱에서 OverflowError가 난다.
+                area, weight = cached_dome_values(diameter, material,
+                                                  thickness)
+
+            except (TypeError, ValueError, AttributeError, OverflowError):
+                print(f'{line_no}행: invalid input.')
+                errors += 1
+                continue
+
+            except KeyError:
+                print(f'{line_no}행: invalid material.')
+                errors += 1
+                continue
+
+            write({'재질': material, '지름': diameter, '두께': thickness,
+                   '면적': area, '무게': weight})
+            written += 1
+
+    info = cached_dome_values.cache_info()
+    print(f'{written}개 계산, {errors}개 오류 → {output_path} '
+          f'(캐시 적중 {info.hits}, 계산 {info.misses})')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='화성 돔 면적/무게 계산')
+    parser.add_argument('--batch', metavar='FILE',
+                        help='돔 사양 CSV 또는 NDJSON(.ndjson/.jsonl) 파일')
+    parser.add_argument('--output', metavar='FILE',
+                        help='--batch 결과 파일 (CSV 또는 NDJSON)')
+    parser.add_argument('--materials', metavar='FILE',
+                        help='재질 표 CSV (material,density g/cm³)')
+    parser.add_argument('--cache-size', type=int, default=CACHE_SIZE,
+                        metavar='N', help='계산 결과 LRU 캐시 크기')
+    parser.add_argument('--result-cap', type=int, default=RESULT_CAP,
+                        metavar='N', help='메모리에 둘 최근 결과 수')
+    parser.add_argument('--result-file', metavar='FILE',
+                        help='넘친 결과를 이어 쓸 바이너리 파일 '
+                             '(기본: 임시 파일)')
+    args = parser.parse_args()
+
+    if args.batch and not args.output:
+        parser.error('--batch에는 --output이 필요합니다.')
+    if args.output and not args.batch:
+        parser.error('--output은 --batch와 함께 써야 합니다.')
+    if args.cache_size < 0:
+        parser.error('--cache-size는 0 이상이어야 합니다.')
+    if args.result_cap < 1:
+        parser.error('--result-cap은 1 이상이어야 합니다.')
+    return args
+
+
+def print_summary(store):
+    print(f'결과 {len(store)}개 (메모리 {len(store.memory)}개)')
+    summary = store.summary()
+    for material, lightest in store.lightest().items():
+        stats = summary[material]
+        print(f'재질 ⇒ {material}, {stats["count"]}개, '
+              f'평균 무게 ⇒ {round(stats["mean_weight"], 3)} kg, '
+              f'최경량 ⇒ 지름 {lightest["지름"]}, 두께 {lightest["두께"]}, '
+              f'무게 {lightest["무게"]} kg')
+
+
 def main():
+    global sphere_results
+
+    args = parse_args()
+    sphere_results.close()
     try:
+        sphere_results = ResultStore(args.result_cap, args.result_file)
+        set_cache_size(args.cache_size)
+        if args.materials:
+            set_materials(load_materials(args.materials))
+        if args.batch:
+            run_batch(args.batch, args.output)
+            return
+
+        materials = ', '.join(DENSITIES)
         while True:
             user_input = input(
-                'Input diameter and material(glass, aluminum, carbon_steel)'
+                f'Input diameter and material({materials})'
                 ' and thickness(default = 1.0): ')
 
             if user_input == 'exit':
                 break
 
+            if user_input == 'summary':
+                print_summary(sphere_results)
+                continue
+
             data = user_input.strip().split()
 
             if len(data) < 2:
@@ -61,6 +315,9 @@ def main():
 
             sphere_area(diameter, material, thickness)
 
+    except ResultFileError as e:
+        print(e)
+
     except ValueError:
         print('invalid input.')
 
@@ -73,6 +330,12 @@ def main():
     except KeyboardInterrupt:
         print()
 
+    except FileNotFoundError as e:
+        print(e)
+
+    finally:
+        sphere_results.close()
+
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,259 @@
+import argparse
+import multiprocessing as mp
+import os
+import time
+
+import numpy as np
+
+from design_dome import DENSITIES, export_batch, sphere_area_batch
+
+CHUNK_SIZE = 2_000_000
+
+
+def pareto_front(weights, thicknesses):
+    # 무게는 가볍게, 두께는 두껍게. 무게순으로 정렬한 뒤 앞의 어떤 설계보다도
+    # 두꺼운 것만 남기면 다른 설계에 지배되지 않는 것들만 남는다.
+    order = np.lexsort((-thicknesses, weights))
+    sorted_thickness = thicknesses[order]
+    best_before = np.maximum.accumulate(sorted_thickness)
+    keep = np.ones(len(order), dtype=bool)
+    keep[1:] = sorted_thickness[1:] > best_before[:-1]
+    return order[keep]
+
+
+class SweepSpace:
+    # 재질마다 지름×두께 공간을 나눈다. 격자면 평탄화한 번호 구간으로,
+    # 무작위면 (시드, 청크 번호)로 청크를 다시 만들 수 있어서 작업에는
+    # 좌표 배열 대신 번호만 넘긴다.
+
+    def __init__(self, materials, diameter_range, thickness_range,
+                 grid=None, samples=None, seed=0):
+        self.materials = list(materials)
+        self.diameter_range = diameter_range
+        self.thickness_range = thickness_range
+        self.grid = grid
+        self.samples = samples
+        self.seed = seed
+
+    @property
+    def points_per_material(self):
+        if self.grid is not None:
+            return self.grid[0] * self.grid[1]
+        return self.samples
+
+    def __len__(self):
+        return self.points_per_material * len(self.materials)
+
+    def jobs(self, chunk_size):
+        total = self.points_per_material
+        for code in range(len(self.materials)):
+            for start in range(0, total, chunk_size):
+                yield code, start, min(start + chunk_size, total)
+
+    def points(self, code, start, stop):
+        if self.grid is not None:
+            n_diameters, n_thicknesses = self.grid
+            flat = np.arange(start, stop)
+            diameters = np.linspace(*self.diameter_range, n_diameters)
+            thicknesses = np.linspace(*self.thickness_range, n_thicknesses)
+            return (diameters[flat // n_thicknesses],
+                    thicknesses[flat % n_thicknesses])
+
+        rng = np.random.default_rng([self.seed, code, start])
+        return (rng.uniform(*self.diameter_range, stop - start),
+                rng.uniform(*self.thickness_range, stop - start))
+
+
+def sweep_chunk(space, target_area, tolerance, job):
+    # 목표 면적 이상(허용 오차 이내)인 설계만 남기고, 청크 안의 파레토
+    # 전선만 돌려준다. 청크 결과는 많아야 수천 개라 전송 비용이 작다.
+    code, start, stop = job
+    diameters, thicknesses = space.points(code, start, stop)
+    material = space.materials[code]
+    area, weight = sphere_area_batch(diameters, material, thicknesses,
+                                     rounded=False)
+
+    keep = area >= target_area
+    if tolerance is not None:
+        keep &= area <= target_area * (1 + tolerance)
+    diameters = diameters[keep]
+    thicknesses = thicknesses[keep]
+    area = area[keep]
+    weight = weight[keep]
+
+    front = pareto_front(weight, thicknesses)
+    codes = np.full(len(front), code, dtype=np.int8)
+    return (stop - start, len(weight),
+            (codes, diameters[front], thicknesses[front], area[front],
+             weight[front]))
+
+
+def merge_fronts(current, incoming):
+    if current is None:
+        return incoming
+    merged = [np.concatenate(pair) for pair in zip(current, incoming)]
+    front = pareto_front(merged[4], merged[2])
+    return tuple(column[front] for column in merged)
+
+
+class SweepResult:
+
+    def __init__(self, materials):
+        self.materials = materials
+        self.points = 0
+        self.candidates = 0
+        self.front = None
+        self.material_fronts = {}
+
+    def add(self, points, candidates, front):
+        self.points += points
+        self.candidates += candidates
+        code = int(front[0][0]) if len(front[0]) else None
+        if code is not None:
+            self.material_fronts[code] = merge_fronts(
+                self.material_fronts.get(code), front)
+        self.front = merge_fronts(self.front, front)
+
+    def lightest(self):
+        # 재질별 전선의 첫 행이 그 재질에서 가장 가벼운 설계다.
+        for code, front in sorted(self.material_fronts.items()):
+            order = np.argsort(front[4], kind='stable')
+            yield self.materials[code], [column[order[0]] for column in front]
+
+    def export(self, path):
+        codes, diameters, thicknesses, area, weight = self.front
+        materials = np.array(self.materials)[codes]
+        export_batch(path, diameters, materials, thicknesses,
+                     np.round(area, 3), np.round(weight, 3))
+
+
+def run_sweep(space, target_area, tolerance=None, workers=None,
+              chunk_size=CHUNK_SIZE, progress=True):
+    # 청크 결과는 imap_unordered로 오는 대로 합친다. 전체 설계는 어디에도
+    # 모아 두지 않으므로 메모리는 청크 크기와 전선 크기에만 비례한다.
+    result = SweepResult(space.materials)
+    jobs = list(space.jobs(chunk_size))
+    workers = workers or os.cpu_count() or 1
+
+    def report(done):
+        if progress:
+            print(f'\r[스윕] {done}/{len(jobs)} 청크, '
+                  f'{result.points:,}/{len(space):,}점', end='', flush=True)
+
+    if workers == 1:
+        for done, job in enumerate(jobs, 1):
+            result.add(*sweep_chunk(space, target_area, tolerance, job))
+            report(done)
+    else:
+        worker = _SweepWorker(space, target_area, tolerance)
+        with mp.Pool(workers) as pool:
+            for done, chunk in enumerate(
+                    pool.imap_unordered(worker, jobs), 1):
+                result.add(*chunk)
+                report(done)
+    if progress:
+        print()
+    return result
+
+
+class _SweepWorker:
+    # Pool에 넘길 수 있도록 공간과 목표를 묶어 둔 호출 객체.
+
+    def __init__(self, space, target_area, tolerance):
+        self.space = space
+        self.target_area = target_area
+        self.tolerance = tolerance
+
+    def __call__(self, job):
+        return sweep_chunk(self.space, self.target_area, self.tolerance, job)
+
+
+def print_result(result, target_area, limit):
+    print(f'목표 면적 {target_area} m² 이상: '
+          f'{result.candidates:,}/{result.points:,}개 설계')
+    if result.front is None or not len(result.front[0]):
+        print('조건을 만족하는 설계가 없습니다.')
+        return
+
+    print('\n재질별 최경량 설계')
+    for material, (_, diameter, thickness, area, weight) in result.lightest():
+        print(f'재질 ⇒ {material}, 지름 ⇒ {diameter:.3f}, '
+              f'두께 ⇒ {thickness:.3f}, 면적 ⇒ {round(area, 3)}, '
+              f'무게 ⇒ {round(weight, 3)} kg')
+
+    codes, diameters, thicknesses, area, weight = result.front
+    print(f'\n파레토 전선 (무게↓, 두께↑) {len(codes)}개')
+    for i in range(min(len(codes), limit)):
+        print(f'재질 ⇒ {result.materials[codes[i]]}, '
+              f'지름 ⇒ {diameters[i]:.3f}, 두께 ⇒ {thicknesses[i]:.3f}, '
+              f'면적 ⇒ {round(area[i], 3)}, 무게 ⇒ {round(weight[i], 3)} kg')
+    if len(codes) > limit:
+        print(f'... 외 {len(codes) - limit}개')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='돔 설계 파라미터 스윕')
+    parser.add_argument('--target-area', type=float, required=True,
+                        metavar='M2', help='필요한 최소 면적')
+    parser.add_argument('--tolerance', type=float, metavar='RATIO',
+                        help='목표 면적 초과 허용 비율 (예: 0.05)')
+    parser.add_argument('--diameter', type=float, nargs=2, default=[1, 100],
+                        metavar=('MIN', 'MAX'))
+    parser.add_argument('--thickness', type=float, nargs=2,
+                        default=[0.1, 10], metavar=('MIN', 'MAX'),
+                        help='두께 범위 (cm)')
+    parser.add_argument('--materials', nargs='+', default=list(DENSITIES),
+                        choices=list(DENSITIES))
+    parser.add_argument('--grid', type=int, nargs=2,
+                        metavar=('DIAMETERS', 'THICKNESSES'),
+                        help='재질마다 지름×두께 격자')
+    parser.add_argument('--samples', type=int, metavar='N',
+                        help='재질마다 무작위 표본 N개')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, metavar='N',
+                        help='프로세스 수 (기본: CPU 수)')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE,
+                        metavar='N')
+    parser.add_argument('--limit', type=int, default=20,
+                        help='출력할 파레토 설계 수')
+    parser.add_argument('--output', metavar='FILE',
+                        help='파레토 전선을 CSV 또는 .npy로 저장')
+    args = parser.parse_args()
+
+    if (args.grid is None) == (args.samples is None):
+        parser.error('--grid와 --samples 중 하나를 지정해야 합니다.')
+    if args.grid is not None and min(args.grid) < 1:
+        parser.error('--grid 값은 1 이상이어야 합니다.')
+    if args.samples is not None and args.samples < 1:
+        parser.error('--samples는 1 이상이어야 합니다.')
+    if args.chunk_size < 1:
+        parser.error('--chunk-size는 1 이상이어야 합니다.')
+    if args.diameter[0] <= 0 or args.diameter[0] > args.diameter[1]:
+        parser.error('--diameter 범위가 올바르지 않습니다.')
+    if args.thickness[0] <= 0 or args.thickness[0] > args.thickness[1]:
+        parser.error('--thickness 범위가 올바르지 않습니다.')
+    return args
+
+
+def main():
+    args = parse_args()
+    space = SweepSpace(args.materials, tuple(args.diameter),
+                       tuple(args.thickness), args.grid, args.samples,
+                       args.seed)
+
+    start = time.perf_counter()
+    result = run_sweep(space, args.target_area, args.tolerance,
+                       args.workers, args.chunk_size)
+    elapsed = time.perf_counter() - start
+
+    print_result(result, args.target_area, args.limit)
+    print(f'\n{result.points:,}점, {elapsed:.2f}s '
+          f'({result.points / elapsed / 1e6:.1f}M점/s)')
+
+    if args.output and result.front is not None:
+        result.export(args.output)
+        print(f'파레토 전선 저장: {args.output}')
+
+
+if __name__ == '__main__':
+    main()
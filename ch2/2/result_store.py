@@ -0,0 +1,199 @@
+import os
+import tempfile
+from collections import deque
+
+import numpy as np
+
+RECORD = np.dtype([('material', '<u2'), ('diameter', '<f8'),
+                   ('thickness', '<f8'), ('area', '<f8'), ('weight', '<f8')])
+FIELDS = ['재질', '지름', '두께', '면적', '무게']
+READ_RECORDS = 65536
+
+
+class ResultFileError(ValueError):
+    # 결과 파일과 재질 목록 파일이 서로 맞지 않는다.
+    pass
+
+
+class MaterialStats:
+    __slots__ = ('count', 'weight_sum', 'lightest')
+
+    def __init__(self):
+        self.count = 0
+        self.weight_sum = 0.0
+        self.lightest = None
+
+    def add(self, count, weight_sum, lightest):
+        self.count += count
+        self.weight_sum += weight_sum
+        if self.lightest is None or lightest[4] < self.lightest[4]:
+            self.lightest = lightest
+
+
+class ResultStore:
+    # 최근 결과 cap개만 메모리에 두고, 넘치면 오래된 것부터 고정 길이
+    # 레코드로 파일 끝에 붙인다. 재질별 개수/합계/최경량 결과는 넣을 때마다
+    # 갱신해서 집계 질의는 파일을 다시 읽지 않는다.
+    # path를 주지 않으면 닫을 때 사라지는 임시 파일에 내보낸다.
+
+    def __init__(self, cap=1000, path=None):
+        if cap < 1:
+            raise ValueError('cap은 1 이상이어야 합니다.')
+        self.cap = cap
+        self.path = path
+        self.memory = deque()
+        self.materials = []
+        self.codes = {}
+        self.stats = {}
+        self.spilled = 0
+        self.file = None
+        if path is not None and os.path.exists(path):
+            self._load()
+
+    @property
+    def materials_path(self):
+        return self.path + '.materials'
+
+    def _open(self):
+        if self.file is None:
+            if self.path is None:
+                self.file = tempfile.TemporaryFile()
+            else:
+                self.file = open(self.path, 'ab+')
+        return self.file
+
+    def _load(self):
+        # 기존 파일이 있으면 재질 목록과 집계만 한 번 훑어서 다시 만든다.
+        # 중간에 끊긴 마지막 레코드는 잘라 내야 이어 붙일 때 어긋나지 않는다.
+        if os.path.exists(self.materials_path):
+            with open(self.materials_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    self._code(line.rstrip('\n'), save=False)
+
+        size = os.path.getsize(self.path)
+        if size % RECORD.itemsize:
+            with open(self.path, 'r+b') as f:
+                f.truncate(size - size % RECORD.itemsize)
+
+        for chunk in self._iter_chunks():
+            if len(chunk) and int(chunk['material'].max()) >= len(
+                    self.materials):
+                raise ResultFileError(
+                    f'{self.path}의 재질 코드가 {self.materials_path}에 '
+                    '없습니다. 두 파일을 함께 옮기거나 지워 주세요.')
+            self.spilled += len(chunk)
+            for code in np.unique(chunk['material']).tolist():
+                rows = chunk[chunk['material'] == code]
+                lightest = rows[np.argmin(rows['weight'])]
+                self._stats(self.materials[code]).add(
+                    len(rows), float(rows['weight'].sum()),
+                    self._to_tuple(lightest))
+
+    def _code(self, material, save=True):
+        code = self.codes.get(material)
+        if code is None:
+            code = self.codes[material] = len(self.materials)
+            self.materials.append(material)
+            if save and self.path is not None:
+                with open(self.materials_path, 'a', encoding='utf-8') as f:
+                    f.write(material + '\n')
+        return code
+
+    def _stats(self, material):
+        stats = self.stats.get(material)
+        if stats is None:
+            stats = self.stats[material] = MaterialStats()
+        return stats
+
+    def _to_tuple(self, record):
+        return (self.materials[int(record['material'])],
+                float(record['diameter']), float(record['thickness']),
+                float(record['area']), float(record['weight']))
+
+    def append(self, result):
+        row = tuple(result[field] for field in FIELDS)
+        self._code(row[0])
+        self._stats(row[0]).add(1, row[4], row)
+        self.memory.append(row)
+        if len(self.memory) > self.cap:
+            # 하나씩 쓰지 않고 절반을 한 번에 내보낸다.
+            self.spill(len(self.memory) - self.cap // 2)
+
+    def spill(self, count=None):
+        count = len(self.memory) if count is None else count
+        if not count:
+            return
+        records = np.empty(count, dtype=RECORD)
+        for i in range(count):
+            row = self.memory.popleft()
+            records[i] = (self.codes[row[0]],) + row[1:]
+        f = self._open()
+        f.seek(0, os.SEEK_END)
+        f.write(records.tobytes())
+        f.flush()
+        self.spilled += count
+
+    def _iter_chunks(self):
+        if self.file is not None:
+            self.file.flush()
+            f = self.file
+            close = False
+        elif self.path is not None and os.path.exists(self.path):
+            f = open(self.path, 'rb')
+            close = True
+        else:
+            return
+
+        try:
+            f.seek(0)
+            while True:
+                data = f.read(READ_RECORDS * RECORD.itemsize)
+                if not data:
+                    break
+                yield np.frombuffer(data, dtype=RECORD)
+
+        finally:
+            if close:
+                f.close()
+
+    def __len__(self):
+        return self.spilled + len(self.memory)
+
+    def __iter__(self):
+        # 파일에 나간 결과부터 넣은 순서대로 dict로 하나씩 낸다.
+        for chunk in self._iter_chunks():
+            for record in chunk:
+                yield dict(zip(FIELDS, self._to_tuple(record)))
+        for row in list(self.memory):
+            yield dict(zip(FIELDS, row))
+
+    def recent(self):
+        return [dict(zip(FIELDS, row)) for row in self.memory]
+
+    def lightest(self, material=None):
+        if material is not None:
+            stats = self.stats.get(material)
+            return None if stats is None else dict(zip(FIELDS,
+                                                       stats.lightest))
+        return {name: dict(zip(FIELDS, stats.lightest))
+                for name, stats in self.stats.items()}
+
+    def summary(self):
+        return {name: {'count': stats.count,
+                       'mean_weight': stats.weight_sum / stats.count,
+                       'min_weight': stats.lightest[4]}
+                for name, stats in self.stats.items()}
+
+    def close(self):
+        # 파일을 지정했다면 메모리에 남은 결과도 내보내서 다음에 이어 쓴다.
+        if self.path is not None:
+            self.spill()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
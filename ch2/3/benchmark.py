@@ -0,0 +1,83 @@
+import argparse
+import csv
+import os
+import random
+import tempfile
+import time
+
+import numpy as np
+
+from numpy_test import read_all_csv_files, read_all_csv_files_parallel
+
+
+def write_synthetic_parts(directory, n_files, n_parts, shuffled=0.0,
+                          missing=0.0, seed=0):
+    # 부품 순서가 같은 파일이 대부분이고, 일부는 순서를 섞고 부품을 빼서
+    # 해시 조인 경로도 같이 지나가게 한다.
+    rng = random.Random(seed)
+    parts = [f'part-{i:07d}' for i in range(n_parts)]
+    paths = []
+    for i in range(n_files):
+        rows = [(part, rng.randint(0, 100)) for part in parts]
+        if i and rng.random() < shuffled:
+            rng.shuffle(rows)
+            rows = [row for row in rows if rng.random() >= missing]
+
+        path = os.path.join(directory, f'parts-{i:04d}.csv')
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['parts', 'strength'])
+            writer.writerows(rows)
+        paths.append(path)
+    return paths
+
+
+def time_call(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def bench_loading(n_files, n_parts, workers_list, shuffled, missing):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = write_synthetic_parts(tmp_dir, n_files, n_parts, shuffled,
+                                      missing)
+        size = sum(os.path.getsize(path) for path in paths)
+        print(f'[부품 CSV 로딩] {n_files}개 파일 × {n_parts:,}부품 '
+              f'({size / 2**20:,.1f} MiB), CPU {os.cpu_count()}개')
+
+        base_time, expected = time_call(read_all_csv_files, paths)
+        print(f'  순차          {base_time:.3f}s')
+        for workers in workers_list:
+            elapsed, found = time_call(read_all_csv_files_parallel, paths,
+                                       workers)
+            if (found[1] != expected[1]
+                    or not np.array_equal(found[2], expected[2],
+                                          equal_nan=True)):
+                raise AssertionError('병렬 로딩 결과가 순차 로딩과 다릅니다.')
+            print(f'  프로세스 {workers:>3}개 {elapsed:.3f}s, '
+                  f'{base_time / elapsed:.2f}배')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='부품 CSV 로딩 벤치마크')
+    parser.add_argument('--files', type=int, default=64)
+    parser.add_argument('--parts', type=int, default=100_000)
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=sorted({2, 4, os.cpu_count() or 1}))
+    parser.add_argument('--shuffled', type=float, default=0.1,
+                        metavar='RATIO', help='순서를 섞을 파일 비율')
+    parser.add_argument('--missing', type=float, default=0.01,
+                        metavar='RATIO', help='섞은 파일에서 뺄 부품 비율')
+    args = parser.parse_args()
+
+    if args.files < 2:
+        parser.error('--files는 2 이상이어야 합니다.')
+    if min(args.workers) < 1:
+        parser.error('--workers는 1 이상이어야 합니다.')
+    bench_loading(args.files, args.parts, args.workers, args.shuffled,
+                  args.missing)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,46 +1,173 @@
-import numpy as np
+import argparse
 import csv
+import glob
+import multiprocessing as mp
+from multiprocessing import shared_memory
 
+import numpy as np
 
-def read_all_csv_files():
-    try:
-        csv_files = [
-            'mars_base/mars_base_main_parts-001.csv',
-            'mars_base/mars_base_main_parts-002.csv',
-            'mars_base/mars_base_main_parts-003.csv'
-        ]
-
-        strength_arrays = []
-        common_parts = None
-
-        for i in range(len(csv_files)):
-
-            with open(csv_files[i], 'r', encoding='utf-8') as f:
-                reader = csv.reader(f)
-                header = next(reader)
+DEFAULT_PATTERN = 'mars_base/mars_base_main_parts-*.csv'
 
-                parts = []
-                strengths = []
-                for row in reader:
-                    part, strength = row[0], float(row[1])
-                    parts.append(part)
-                    strengths.append(strength)
 
-                if common_parts is None:
-                    common_parts = parts
-                else:
-                    if parts != common_parts:
-                        raise ValueError(f'{csv_files[i]}'
-                                         '의 parts 열이 다른 파일과 다릅니다!')
+def expand_paths(patterns):
+    # 와일드카드가 있으면 glob으로 펼치고(이름순), 없으면 그대로 쓴다.
+    paths = []
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            matched = sorted(glob.glob(pattern))
+            if not matched:
+                raise FileNotFoundError(f'일치하는 파일이 없습니다: {pattern}')
+            paths.extend(matched)
+        else:
+            paths.append(pattern)
+    return paths
 
-            strength_arrays.append(np.array(strengths).reshape(-1, 1))
 
-        merged_strengths = np.concatenate(strength_arrays, axis=1)
+def read_parts_file(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+
+        parts = []
+        strengths = []
+        for row in reader:
+            parts.append(row[0])
+            strengths.append(float(row[1]))
+
+    return header, parts, strengths
+
+
+class PartsJoin:
+    # 부품 이름 → 행 번호 해시 조인. 파일마다 부품 순서가 달라도, 빠진 부품이
+    # 있어도 같은 행에 맞춰 넣고 값이 없는 칸은 NaN으로 둔다. 처음 보는
+    # 부품은 맨 아래 행에 붙이고, 행이 모자라면 두 배로 늘린다.
+
+    def __init__(self, n_files, capacity, values=None):
+        # values를 주면 (공유 메모리 등) 그 배열을 NaN으로 채워 그대로 쓴다.
+        self.index = {}
+        self.parts = []
+        if values is None:
+            values = np.empty((max(capacity, 1), n_files))
+        values.fill(np.nan)
+        self.values = values
+
+    def rows(self, parts):
+        # 한 파일에 같은 이름이 여러 번 나오면 k번째 것끼리 맞춘다.
+        index = self.index
+        known = self.parts
+        seen = {}
+        rows = []
+        for part in parts:
+            count = seen.get(part, 0)
+            seen[part] = count + 1
+            key = (part, count) if count else part
+            row = index.get(key)
+            if row is None:
+                row = index[key] = len(known)
+                known.append(part)
+            rows.append(row)
+        return np.array(rows, dtype=np.intp)
+
+    def reserve(self, size):
+        capacity = len(self.values)
+        if size <= capacity:
+            return
+        values = np.full((max(size, capacity * 2), self.values.shape[1]),
+                         np.nan)
+        values[:capacity] = self.values
+        self.values = values
+
+    def add(self, column, parts, strengths):
+        # 부품 순서가 지금까지와 같으면 해시 조회 없이 그대로 한 열을 채운다.
+        if parts == self.parts:
+            self.values[:len(parts), column] = strengths
+            return
+
+        rows = self.rows(parts)
+        self.reserve(len(self.parts))
+        self.values[rows, column] = strengths
+
+    def matrix(self):
+        return self.values[:len(self.parts)]
+
+
+def read_all_csv_files(csv_files=None):
+    # 첫 파일의 부품 수로 (부품 × 파일) 배열을 잡고 파일마다 한 열씩 채운다.
+    # 행은 부품 이름으로 맞추므로 파일 사이의 순서 차이나 누락은 상관없다.
+    csv_files = expand_paths(csv_files or [DEFAULT_PATTERN])
+
+    header, parts, strengths = read_parts_file(csv_files[0])
+    join = PartsJoin(len(csv_files), len(parts))
+    join.add(0, parts, strengths)
+
+    for i in range(1, len(csv_files)):
+        _, parts, strengths = read_parts_file(csv_files[i])
+        join.add(i, parts, strengths)
+
+    return header, join.parts, join.matrix()
+
+
+# 병렬 로더 작업 프로세스가 붙잡아 두는 공유 행렬과 기준 부품 순서
+_shared = {}
+
+
+def attach_shared_matrix(name, shape, parts):
+    memory = shared_memory.SharedMemory(name=name)
+    _shared['memory'] = memory
+    _shared['values'] = np.ndarray(shape, dtype=np.float64,
+                                   buffer=memory.buf, order='F')
+    _shared['parts'] = parts
+
+
+def load_parts_column(job):
+    # 기준 순서와 같은 파일은 공유 행렬의 자기 열에 바로 쓰고, 순서가 다른
+    # 파일만 부모가 해시 조인하도록 파싱 결과를 돌려준다.
+    column, path = job
+    _, parts, strengths = read_parts_file(path)
+    if parts == _shared['parts']:
+        _shared['values'][:, column] = strengths
+        return column, None, None
+    return column, parts, strengths
+
+
+def merge_into_shared(memory, shape, csv_files, first, workers):
+    header, parts, strengths = first
+    values = np.ndarray(shape, dtype=np.float64, buffer=memory.buf,
+                        order='F')
+    join = PartsJoin(len(csv_files), len(parts), values)
+    join.add(0, parts, strengths)
+
+    jobs = list(enumerate(csv_files))[1:]
+    with mp.Pool(workers, initializer=attach_shared_matrix,
+                 initargs=(memory.name, shape, parts)) as pool:
+        results = pool.map(load_parts_column, jobs)
+
+    # 순서가 다른 파일은 파일 순서대로 조인해야 새 부품의 행 순서가
+    # 순차 로딩과 같아진다.
+    for column, file_parts, file_strengths in results:
+        if file_parts is not None:
+            join.add(column, file_parts, file_strengths)
+
+    return header, join.parts, np.array(join.matrix(), order='C')
+
+
+def read_all_csv_files_parallel(csv_files=None, workers=None):
+    # read_all_csv_files와 같은 결과를 낸다. 첫 파일로 행 순서를 정하고
+    # 나머지 파일은 프로세스 풀에서 파싱한다. 행렬은 열 우선(F) 배열로
+    # 공유 메모리에 두어서 각 프로세스가 자기 열을 연속으로 채운다.
+    csv_files = expand_paths(csv_files or [DEFAULT_PATTERN])
+    first = read_parts_file(csv_files[0])
+    shape = (max(len(first[1]), 1), len(csv_files))
+    memory = shared_memory.SharedMemory(create=True,
+                                        size=shape[0] * shape[1] * 8)
+    try:
+        result = merge_into_shared(memory, shape, csv_files, first, workers)
 
-        return header, common_parts, merged_strengths
+    finally:
+        memory.unlink()
 
-    except Exception:
-        raise
+    memory.close()
+    return result
 
 
 def filter_strength(header, parts, strengths):
@@ -64,15 +191,31 @@ def read_bonus_file():
     return data
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description='부품 강도 병합')
+    parser.add_argument('files', nargs='*', metavar='FILE',
+                        help=f'부품 CSV 또는 glob (기본: {DEFAULT_PATTERN})')
+    parser.add_argument('--workers', type=int, metavar='N',
+                        help='N개 프로세스로 파일을 나눠 읽기')
+    args = parser.parse_args()
+
+    if args.workers is not None and args.workers < 1:
+        parser.error('--workers는 1 이상이어야 합니다.')
+    return args
+
+
 def main():
+    args = parse_args()
     try:
-        header, parts, merged_strengths = read_all_csv_files()
+        if args.workers and args.workers > 1:
+            header, parts, merged_strengths = read_all_csv_files_parallel(
+                args.files, args.workers)
+        else:
+            header, parts, merged_strengths = read_all_csv_files(args.files)
         print(merged_strengths)
 
-        arr1, arr2, arr3 = [merged_strengths[0:len(merged_strengths), i].
-                            tolist() for i in range(merged_strengths.shape[1])]
-
-        row_means = merged_strengths.mean(axis=1)
+        # 일부 파일에 없는 부품은 있는 값만으로 평균을 낸다.
+        row_means = np.nanmean(merged_strengths, axis=1)
         print(row_means)
 
         filter_strength(header, parts, row_means)